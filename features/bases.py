@@ -36,13 +36,13 @@ class FeatureSet(metaclass=meta.FeatureSetMeta):
 
 
     >>> fs('1').atoms
-    [FeatureSet('+1 +sg'), FeatureSet('+1 +pl')]
+    (FeatureSet('+1 +sg'), FeatureSet('+1 +pl'))
 
     >>> fs('1').upper_neighbors
-    [FeatureSet('-3'), FeatureSet('-2')]
+    (FeatureSet('-3'), FeatureSet('-2'))
 
     >>> fs('1').lower_neighbors
-    [FeatureSet('+1 +sg'), FeatureSet('+1 +pl')]
+    (FeatureSet('+1 +sg'), FeatureSet('+1 +pl'))
 
     >>> list(fs('1').upset())  # doctest: +NORMALIZE_WHITESPACE
     [FeatureSet('+1'),
@@ -100,19 +100,52 @@ class FeatureSet(metaclass=meta.FeatureSetMeta):
     False
     """
 
-    def __init__(self, concept):
+    __slots__ = ('concept', 'index', '_extent', '_intent',
+                 '_string', '_string_maximal', '_string_extent',
+                 '_atoms', '_upper_neighbors', '_lower_neighbors')
+
+    def __init__(self, concept, string=None):
         self.concept = concept  #: The corresponding FCA concept.
         self.index = concept.index  #: The position of the feature set with its system.
-        self.string = ' '.join(concept.minimal())  #: Space-concatenated minimal features.
-        self.string_maximal = ' '.join(concept.intent)  #: All features space-concatenated.
-        self.string_extent = ' '.join(concept.extent)  #: Space-concatenated extent labels.
+        # plain int bitmasks of the extent/intent for fast comparisons
+        self._extent = int(concept._extent)
+        self._intent = int(concept._intent)
+        if string is not None:
+            self._string = string
+
+    @property
+    def string(self):
+        """Space-concatenated minimal features."""
+        try:
+            return self._string
+        except AttributeError:
+            self._string = result = ' '.join(self.concept.minimal())
+            return result
+
+    @property
+    def string_maximal(self):
+        """All features space-concatenated."""
+        try:
+            return self._string_maximal
+        except AttributeError:
+            self._string_maximal = result = ' '.join(self.concept.intent)
+            return result
+
+    @property
+    def string_extent(self):
+        """Space-concatenated extent labels."""
+        try:
+            return self._string_extent
+        except AttributeError:
+            self._string_extent = result = ' '.join(self.concept.extent)
+            return result
 
     def __repr__(self):
         return f'{self.__class__.__name__}({self.string!r})'
 
     def __reduce__(self):
         if self.system.key is None:
-            return self.system.__class__, (self.system._config, self.string)
+            return self.system._reduce_unnamed(self.index)
         return self.system.__class__, (self.system.key, self.string)
 
     def __str__(self):
@@ -129,61 +162,83 @@ class FeatureSet(metaclass=meta.FeatureSetMeta):
 
     @property
     def atoms(self):
-        """The subsumed atoms."""
-        indexes = (c.index for c in self.concept.atoms)
-        return list(map(self._sibling, indexes))
+        """The subsumed atoms (shared tuple)."""
+        try:
+            return self._atoms
+        except AttributeError:
+            self._atoms = result = self._siblings(self.concept.atoms)
+            return result
 
     @property
     def upper_neighbors(self):
-        """The directly implied neighbors."""
-        indexes = (c.index for c in self.concept.upper_neighbors)
-        return list(map(self._sibling, indexes))
+        """The directly implied neighbors (shared tuple)."""
+        try:
+            return self._upper_neighbors
+        except AttributeError:
+            self._upper_neighbors = result = self._siblings(self.concept.upper_neighbors)
+            return result
 
     @property
     def lower_neighbors(self):
-        """The directly subsumed neighbors."""
-        indexes = (c.index for c in self.concept.lower_neighbors)
-        return list(map(self._sibling, indexes))
+        """The directly subsumed neighbors (shared tuple)."""
+        try:
+            return self._lower_neighbors
+        except AttributeError:
+            self._lower_neighbors = result = self._siblings(self.concept.lower_neighbors)
+            return result
+
+    def _siblings(self, concepts):
+        return tuple(map(self._sibling, (c.index for c in concepts)))
 
     def upset(self):
         """Return the list of implied neighbors (including self)."""
-        indexes = (c.index for c in self.concept.upset())
-        return list(map(self._sibling, indexes))
+        return list(map(self._sibling, self.system.upset_indexes((self,))))
 
     def downset(self):
         """Return the list of subsumed neighbors (including self)."""
-        indexes = (c.index for c in self.concept.downset())
-        return list(map(self._sibling, indexes))
+        return list(map(self._sibling, self.system.downset_indexes((self,))))
 
     def subsumes(self, other):
         """Submsumption comparison."""
-        return self.concept.subsumes(other.concept)
+        return self._extent | other._extent == self._extent
 
     def implies(self, other):
         """Implication comparison."""
-        return self.concept.implies(other.concept)
+        return self._extent & other._extent == self._extent
 
     __le__ = subsumes
     __ge__ = implies
 
     def properly_subsumes(self, other):
         """Proper subsumption comparison."""
-        return self.concept.properly_subsumes(other.concept)
+        return self._extent | other._extent == self._extent != other._extent
 
     def properly_implies(self, other):
         """Proper implication comparison."""
-        return self.concept.properly_implies(other.concept)
+        return self._extent & other._extent == self._extent != other._extent
 
     __lt__ = properly_subsumes
     __gt__ = properly_implies
 
     def intersection(self, other):
         """Return the closest implied neighbor (generalization, join)."""
+        joins = self.system._joins
+        if joins is None:
+            joins = self.system._lookup_tables()[0]
+        if joins:
+            return self._sibling(joins[self.index][other.index])
+
         join = self.concept.join(other.concept)
         return self._sibling(join.index)
 
     def union(self, other):
         """Return the closest subsumed neighbor (unification, meet)."""
+        meets = self.system._meets
+        if meets is None:
+            meets = self.system._lookup_tables()[1]
+        if meets:
+            return self._sibling(meets[self.index][other.index])
+
         meet = self.concept.meet(other.concept)
         return self._sibling(meet.index)
 
@@ -192,25 +247,30 @@ class FeatureSet(metaclass=meta.FeatureSetMeta):
 
     def incompatible_with(self, other):
         """Empty common extent comparison."""
-        return self.concept.incompatible_with(other.concept)
+        return not self._extent & other._extent
 
     def complement_of(self, other):
         """Empty common extent and universal extent union comparison."""
-        return self.concept.complement_of(other.concept)
+        return (not self._extent & other._extent
+                and self._extent | other._extent == self.system.supremum._extent)
 
     def subcontrary_with(self, other):
         """Nonempty common extent and universal extent union comparison."""
-        return self.concept.subcontrary_with(other.concept)
+        return (self._extent & other._extent != 0
+                and self._extent | other._extent == self.system.supremum._extent)
 
     def orthogonal_to(self, other):
         """Nonempty common extent, incomparable, nonempty extent union comparison."""
-        return self.concept.orthogonal_to(other.concept)
+        meet = self._extent & other._extent
+        return (meet != 0 and meet != self._extent and meet != other._extent
+                and self._extent | other._extent != self.system.supremum._extent)
 
     # internal interface used by cases
     def _upper_neighbors_nonsup(self):
-        indexes = (c.index for c in self.concept.upper_neighbors
-                   if c.upper_neighbors)
-        return list(map(self._sibling, indexes))
+        upper = self.upper_neighbors
+        if upper and upper[-1] is self.system.supremum:  # sorted shortlex
+            return upper[:-1]
+        return upper
 
     def _upper_neighbors_union_nonsup(self, other):
         if other.properly_subsumes(self):
@@ -223,7 +283,7 @@ class FeatureSet(metaclass=meta.FeatureSetMeta):
         return map(self._sibling, indexes)
 
     def _upset_nonsup(self):
-        indexes = (c.index for c in tools.butlast(self.concept.upset()))
+        indexes = self.system.upset_indexes((self,))[:-1]
         return map(self._sibling, indexes)
 
     def _upset_union_nonsup(self, other):
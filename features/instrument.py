@@ -0,0 +1,101 @@
+"""Opt-in call counts and timings of feature system operations."""
+
+import collections
+import functools
+import threading
+import time
+
+__all__ = ['OPERATIONS', 'OperationInfo', 'Stats']
+
+OPERATIONS = ('build', 'parse', 'closure',
+              'upset', 'downset', 'upset_union', 'downset_union')
+
+OperationInfo = collections.namedtuple('OperationInfo', ['count', 'total',
+                                                         'p50', 'p90', 'p99'])
+
+
+class Stats(object):
+    """Per-operation call counts, cumulative and percentile timings.
+
+    Percentiles are computed over the last ``samples`` calls of each
+    operation. ``callback(system, operation, seconds)`` is called after each
+    recorded call and with ``operation='invalid'`` and ``seconds=None`` for
+    each rejected invalid featureset.
+
+    >>> stats = Stats()
+
+    >>> for seconds in (0.25, 0.5, 1.0):
+    ...     stats.record('parse', seconds)
+
+    >>> stats.info()['parse']
+    OperationInfo(count=3, total=1.75, p50=0.5, p90=1.0, p99=1.0)
+
+    >>> stats.reject()
+    >>> stats.invalid
+    1
+    """
+
+    def __init__(self, system=None, callback=None, samples=1024):
+        self.system = system
+        self.callback = callback  #: ``callback(system, operation, seconds)`` or ``None``.
+        self.invalid = 0  #: Number of rejected invalid featuresets.
+        self._counts = collections.Counter()
+        self._totals = collections.defaultdict(float)
+        self._samples = collections.defaultdict(lambda: collections.deque(maxlen=samples))
+        self._lock = threading.Lock()
+
+    def record(self, operation, seconds):
+        """Record one call of ``operation`` taking ``seconds``."""
+        with self._lock:
+            self._counts[operation] += 1
+            self._totals[operation] += seconds
+            self._samples[operation].append(seconds)
+        if self.callback is not None:
+            self.callback(self.system, operation, seconds)
+
+    def reject(self):
+        """Record one rejected invalid featureset."""
+        with self._lock:
+            self.invalid += 1
+        if self.callback is not None:
+            self.callback(self.system, 'invalid', None)
+
+    def timed(self, operation, func):
+        """Return ``func`` wrapped to record its calls as ``operation``."""
+        record = self.record
+        perf_counter = time.perf_counter
+
+        @functools.wraps(func)
+        def timed_func(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(operation, perf_counter() - start)
+
+        return timed_func
+
+    def info(self):
+        """Return a dict mapping recorded operations to :class:`.OperationInfo`."""
+        with self._lock:
+            return {op: OperationInfo(count, self._totals[op],
+                                      *_percentiles(self._samples[op], (50, 90, 99)))
+                    for op, count in self._counts.items()}
+
+    def clear(self):
+        """Reset all counts and timings."""
+        with self._lock:
+            self.invalid = 0
+            self._counts.clear()
+            self._totals.clear()
+            self._samples.clear()
+
+
+def _percentiles(samples, percents):
+    """Return the nearest-rank percentiles of ``samples``.
+
+    >>> _percentiles([3, 1, 2, 4], (25, 50, 100))
+    [1, 2, 4]
+    """
+    ordered = sorted(samples)
+    return [ordered[max(0, -(-p * len(ordered) // 100) - 1)] for p in percents]
@@ -0,0 +1,284 @@
+"""Build concept lattices from integer bitmasks."""
+
+import functools
+import itertools
+
+__all__ = ['build', 'extend']
+
+AUTO_MIN_OBJECTS = 16  # use build() from this context size with builder='auto'
+
+_BITS = bytes.maketrans(b'01', b'\x00\x01')
+
+
+def members(mask):
+    """Return the tuple of the indexes of the set bits in ``mask``.
+
+    >>> members(0b10110)
+    (1, 2, 4)
+
+    >>> members(1 << 100 | 1)
+    (0, 100)
+    """
+    if mask.bit_count() * 16 < mask.bit_length():  # sparse: pop the lowest bits
+        result = []
+        while mask:
+            low = mask & -mask
+            result.append(low.bit_length() - 1)
+            mask ^= low
+        return tuple(result)
+    bits = bin(mask)[:1:-1].encode('ascii').translate(_BITS)
+    return tuple(itertools.compress(itertools.count(), bits))
+
+
+def extension(intent, property_extents, universe):
+    """Return the extent mask of the ``intent`` mask."""
+    extent = universe
+    for p in members(intent):
+        extent &= property_extents[p]
+    return extent
+
+
+def intension(extent, property_extents):
+    """Return the intent mask of the ``extent`` mask."""
+    return sum(1 << p for p, e in enumerate(property_extents) if extent & e == extent)
+
+
+def upper_covers(extents, intents, rows):
+    """Return the list of upper neighbor indexes for each concept.
+
+    ``extents`` and ``intents`` are the masks of all concepts, ``rows`` the
+    intent masks of the objects (cf. C. Lindig. 2000. Fast Concept Analysis).
+
+    >>> upper_covers([0b00, 0b01, 0b10, 0b11], [0b11, 0b01, 0b10, 0b00], [0b01, 0b10])
+    [[1, 2], [3], [3], []]
+    """
+    universe = (1 << len(rows)) - 1
+    index = {intent: i for i, intent in enumerate(intents)}
+    result = []
+    for extent, intent in zip(extents, intents):
+        covers = []
+        minimal = universe & ~extent
+        for g in members(minimal):
+            # intents are closed under intersection: no closure computation
+            j = index[intent & rows[g]]
+            if minimal & extents[j] & ~extent & ~(1 << g):
+                minimal &= ~(1 << g)
+            else:
+                covers.append(j)
+        result.append(covers)
+    return result
+
+
+def close_by_one(property_extents, rows, branches=None):
+    """Yield the ``(extent, intent)`` masks of all concepts (Close-by-One).
+
+    With ``branches``, only yield the concepts below the given first-level
+    branches (property indexes) of the search tree, without the top concept.
+
+    >>> sorted(close_by_one([0b01, 0b10], [0b01, 0b10]))
+    [(0, 3), (1, 1), (2, 2), (3, 0)]
+    """
+    m = len(property_extents)
+    full = (1 << m) - 1
+
+    def intension(extent):
+        intent = full
+        for o in members(extent):
+            intent &= rows[o]
+        return intent
+
+    def descend(extent, intent, start, stop):
+        for j in range(start, stop):
+            if intent >> j & 1:
+                continue
+            new_extent = extent & property_extents[j]
+            new_intent = intension(new_extent)
+            low = (1 << j) - 1
+            if new_intent & low == intent & low:  # canonicity test
+                yield new_extent, new_intent
+                yield from descend(new_extent, new_intent, j + 1, m)
+
+    extent = (1 << len(rows)) - 1
+    intent = intension(extent)
+    if branches is None:
+        yield extent, intent
+        yield from descend(extent, intent, 0, m)
+    else:
+        for j in branches:
+            yield from descend(extent, intent, j, j + 1)
+
+
+def _close_by_one_branch(args):
+    property_extents, rows, branch = args
+    return list(close_by_one(property_extents, rows, [branch]))
+
+
+def build(context, workers=1):
+    """Return the lattice of ``context`` computed on integer bitmasks.
+
+    With ``workers`` other than ``1``, split the first level of the search
+    tree over a process pool (``None``: one process per CPU). The result
+    equals ``context.lattice`` (same concept order and neighbors).
+    """
+    property_extents = [int(e) for e in context._extents]
+    rows = [int(r) for r in context._intents]
+    if workers == 1:
+        found = list(close_by_one(property_extents, rows))
+    else:
+        import concurrent.futures
+
+        found = [next(close_by_one(property_extents, rows))]
+        args = [(property_extents, rows, j) for j in range(len(property_extents))]
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+            for branch in executor.map(_close_by_one_branch, args):
+                found.extend(branch)
+    extents, intents = zip(*found)
+    return _fromlist(context, extents, intents, rows)
+
+
+@functools.cache
+def _lattice_class():
+    import concepts
+
+    class Lattice(concepts.lattices.Lattice):
+        """Lattice with the concept sort keys computed on plain ints."""
+
+        @staticmethod
+        def _shortlex(concept):
+            extent = concept._extent
+            return extent.bit_count(), _reinverted(extent, extent._len)
+
+        @staticmethod
+        def _longlex(concept):
+            extent = concept._extent
+            return -extent.bit_count(), _reinverted(extent, extent._len)
+
+    return Lattice
+
+
+def _reinverted(n, r):
+    """Return ``n`` with reversed and inverted bits of length ``r`` (cf. ``bitsets``).
+
+    >>> _reinverted(1, 6)
+    31
+    """
+    return int(format(n, f'0{r}b')[::-1], 2) ^ ((1 << r) - 1)
+
+
+def _fromlist(context, extents, intents, rows):
+    upper = upper_covers(extents, intents, rows)
+    lower = [[] for _ in extents]
+    for i, covers in enumerate(upper):
+        for j in covers:
+            lower[j].append(i)
+    lattice = [(members(e), members(i), u, l)
+               for e, i, u, l in zip(extents, intents, upper, lower)]
+    return _lattice_class()._fromlist(context, lattice, True)
+
+
+def order_sets(lattice):
+    """Return the upset and downset bitmasks of all concepts of ``lattice``.
+
+    Returns ``(upsets, downsets, dorder)``: ``upsets[i]`` has the bits of the
+    indexes of the concepts implied by concept ``i``, ``downsets[i]`` the bits
+    of the ``dindex`` of the concepts subsumed by it, ``dorder`` maps
+    ``dindex`` to index.
+    """
+    upsets = [0] * len(lattice)
+    for c in reversed(lattice):  # upper neighbors have a higher index
+        mask = 1 << c.index
+        for u in c.upper_neighbors:
+            mask |= upsets[u.index]
+        upsets[c.index] = mask
+
+    dordered = sorted(lattice, key=lambda c: c.dindex)
+    downsets = [0] * len(lattice)
+    for c in reversed(dordered):  # lower neighbors have a higher dindex
+        mask = 1 << c.dindex
+        for n in c.lower_neighbors:
+            mask |= downsets[n.index]
+        downsets[c.index] = mask
+    return upsets, downsets, tuple(c.index for c in dordered)
+
+
+def from_intents(context, intents):
+    """Return the lattice of ``context`` with the given concept ``intents`` masks.
+
+    ``intents`` must be the complete set of closed intents of ``context``.
+    """
+    property_extents = [int(e) for e in context._extents]
+    universe = (1 << len(context.objects)) - 1
+    intents = list(intents)
+    extents = [extension(i, property_extents, universe) for i in intents]
+    return _fromlist(context, extents, intents, [int(r) for r in context._intents])
+
+
+def extend(fs, objects=(), properties=()):
+    """Return ``(context, strings)`` of ``fs`` with added objects and properties.
+
+    ``objects`` are ``(object, features)`` pairs, ``properties`` are
+    ``(property, objects)`` pairs. The closed intents are derived from the
+    ones of ``fs`` by intersection with the new rows/columns.
+    """
+    import concepts
+
+    objects = [(o, tuple(features)) for o, features in objects]
+    properties = [(p, set(extent)) for p, extent in properties]
+    old = fs.context
+
+    all_objects = old.objects + tuple(o for o, _ in objects)
+    all_properties = old.properties + tuple(p for p, _ in properties)
+    index = {p: i for i, p in enumerate(all_properties)}
+    for o, features in objects:
+        unknown = [f for f in features if f not in index]
+        if unknown:
+            raise ValueError(f'unknown features for {o!r}: {unknown!r}')
+    for p, extent in properties:
+        unknown = extent.difference(all_objects)
+        if unknown:
+            raise ValueError(f'unknown objects for {p!r}: {sorted(unknown)!r}')
+
+    bools = [row + tuple(o in extent for _, extent in properties)
+             for o, row in zip(old.objects, old.bools)]
+    bools += [tuple(p in features for p in old.properties)
+              + tuple(p in features or o in extent for p, extent in properties)
+              for o, features in objects]
+    context = concepts.Context(all_objects, all_properties, bools)
+
+    intents = {f._intent for f in fs}
+    if properties:
+        old_universe = (1 << len(old.objects)) - 1
+        old_extents = [e & old_universe for e in map(int, context._extents)]
+        extents = {f._extent for f in fs}
+        for p, _ in properties:
+            column = old_extents[index[p]]
+            extents |= {e & column for e in extents}
+        intents = {intension(e, old_extents) for e in extents}
+
+    intents.add((1 << len(all_properties)) - 1)
+    rows = [int(r) for r in context._intents[len(old.objects):]]
+    for row in rows:
+        intents |= {i & row for i in intents}
+
+    lattice = from_intents(context, intents)
+    context.lattice = lattice
+    return context, _reuse_strings(fs, lattice, rows if not properties else None)
+
+
+def _reuse_strings(fs, lattice, rows):
+    """Return minimal strings of ``fs`` still minimal in ``lattice`` (else ``None``)."""
+    if rows is None:
+        return None
+    old = {f._intent: f for f in fs}
+    strings = []
+    for concept in lattice:
+        intent = int(concept._intent)
+        f = old.get(intent)
+        string = getattr(f, '_string', None)
+        if string is not None:
+            minimal = sum(1 << i for i, p in enumerate(fs.context.properties)
+                          if p in string.split())
+            if any(minimal & r == minimal and intent & r != intent for r in rows):
+                string = None
+        strings.append(string)
+    return strings
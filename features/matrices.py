@@ -0,0 +1,265 @@
+"""Vectorized whole-system computations with NumPy (optional dependency)."""
+
+import numbers
+
+__all__ = ['RELATIONS', 'incidence', 'relation_matrix',
+           'to_indexes', 'from_indexes',
+           'join_pairs', 'meet_pairs', 'join_groups', 'meet_groups']
+
+RELATIONS = ('subsumes', 'implies', 'properly_subsumes', 'properly_implies',
+             'incompatible_with', 'complement_of', 'subcontrary_with', 'orthogonal_to')
+
+
+def incidence(masks, size):
+    """Return the boolean matrix with the ``size`` low bits of each int in ``masks``.
+
+    >>> incidence([0b101, 0b010], 3)
+    array([[ True, False,  True],
+           [False,  True, False]])
+    """
+    import numpy as np
+
+    nbytes = (size + 7) // 8
+    buffer = b''.join(m.to_bytes(nbytes, 'little') for m in masks)
+    bits = np.frombuffer(buffer, dtype=np.uint8).reshape(-1, nbytes)
+    bits = np.unpackbits(bits, axis=1, count=size, bitorder='little')
+    return bits.astype(bool)
+
+
+def relation_matrix(fs, kind, subset=None, sparse=False):
+    """Return the boolean matrix of ``kind`` between all (``subset``) featuresets.
+
+    >>> from features import FeatureSystem
+
+    >>> fs = FeatureSystem('plural')
+
+    >>> relation_matrix(fs, 'subsumes', [fs('-3'), fs('+1'), fs('+sg')])
+    array([[ True,  True, False],
+           [False,  True, False],
+           [False, False,  True]])
+    """
+    import numpy as np
+
+    if kind not in RELATIONS:
+        raise ValueError(f'unknown relation kind: {kind!r}'
+                         f' (must be one of {RELATIONS!r})')
+
+    featuresets = fs if subset is None else [fs[f] if isinstance(f, numbers.Integral) else f
+                                             for f in subset]
+    masks = [f._extent for f in featuresets]
+    extents = incidence(masks, len(fs.context.objects))
+    if sparse:
+        return _sparse_relation_matrix(kind, masks, extents)
+
+    extents = extents.astype(np.int32)
+    common = extents @ extents.T
+    sizes = extents.sum(axis=1)
+    rows, cols = sizes[:, np.newaxis], sizes[np.newaxis, :]
+
+    if kind in ('subsumes', 'properly_subsumes'):
+        result = common == cols
+        if kind == 'properly_subsumes':
+            result &= rows != cols
+    elif kind in ('implies', 'properly_implies'):
+        result = common == rows
+        if kind == 'properly_implies':
+            result &= rows != cols
+    elif kind == 'incompatible_with':
+        result = common == 0
+    else:
+        universal = rows + cols - common == len(fs.context.objects)
+        if kind == 'complement_of':
+            result = (common == 0) & universal
+        elif kind == 'subcontrary_with':
+            result = (common != 0) & universal
+        else:
+            result = ((common != 0) & (common != rows) & (common != cols)
+                      & ~universal)
+    return result
+
+
+def _sparse_relation_matrix(kind, masks, extents):
+    """Return the ``scipy.sparse.csr_matrix`` of ``kind`` from the extent incidence.
+
+    Only the pairs with overlapping extents are compared (the nonzero pattern
+    of the sparse product), the others are added per kind where they can hold.
+    ``'incompatible_with'`` holds off that pattern, so its result is dense.
+    """
+    import numpy as np
+    from scipy import sparse
+
+    n = len(masks)
+    matrix = sparse.csr_matrix(extents, dtype=np.int32)
+    common = (matrix @ matrix.T).tocoo()
+    rows, cols, values = common.row, common.col, common.data
+    sizes = np.asarray(matrix.sum(axis=1)).ravel()
+    size_rows, size_cols = sizes[rows], sizes[cols]
+    empty = np.flatnonzero(sizes == 0)
+    everything = np.arange(n)
+
+    if kind in ('subsumes', 'properly_subsumes', 'implies', 'properly_implies'):
+        if kind.endswith('subsumes'):
+            keep = values == size_cols
+            # the empty extent is subsumed by everything (no overlap)
+            extra_rows, extra_cols = np.repeat(everything, len(empty)), np.tile(empty, n)
+        else:
+            keep = values == size_rows
+            extra_rows, extra_cols = np.repeat(empty, n), np.tile(everything, len(empty))
+        if kind.startswith('properly'):
+            keep &= size_rows != size_cols
+            different = sizes[extra_rows] != sizes[extra_cols]
+            extra_rows, extra_cols = extra_rows[different], extra_cols[different]
+        rows = np.concatenate([rows[keep], extra_rows])
+        cols = np.concatenate([cols[keep], extra_cols])
+    elif kind == 'incompatible_with':
+        result = np.ones((n, n), dtype=bool)
+        result[rows, cols] = False
+        return sparse.csr_matrix(result)
+    elif kind == 'complement_of':
+        universe = (1 << extents.shape[1]) - 1
+        positions = {}
+        for j, mask in enumerate(masks):
+            positions.setdefault(mask, []).append(j)
+        pairs = [(i, j) for i, mask in enumerate(masks)
+                 for j in positions.get(universe ^ mask, ())]
+        rows = np.array([i for i, _ in pairs], dtype=np.intp)
+        cols = np.array([j for _, j in pairs], dtype=np.intp)
+    else:
+        universal = size_rows + size_cols - values == extents.shape[1]
+        if kind == 'subcontrary_with':
+            keep = universal
+        else:
+            keep = (values != size_rows) & (values != size_cols) & ~universal
+        rows, cols = rows[keep], cols[keep]
+
+    data = np.ones(len(rows), dtype=bool)
+    return sparse.csr_matrix((data, (rows, cols)), shape=(n, n))
+
+
+def to_indexes(featuresets):
+    """Return the integer array of the indexes of ``featuresets``."""
+    import numpy as np
+
+    return np.fromiter((f.index for f in featuresets), dtype=np.intp)
+
+
+def from_indexes(fs, indexes):
+    """Return the list of featuresets of ``fs`` with the given ``indexes``."""
+    return list(map(fs._featuresets.__getitem__, map(int, indexes)))
+
+
+class MaskArrays(object):
+    """Extent/intent bitmasks of all featuresets with sorted lookup."""
+
+    def __init__(self, fs):
+        import numpy as np
+
+        self.extents = self._masks([f._extent for f in fs], len(fs.context.objects))
+        self.intents = self._masks([f._intent for f in fs], len(fs.context.properties))
+        self.extent_order = np.argsort(self.extents, kind='stable')
+        self.intent_order = np.argsort(self.intents, kind='stable')
+        self.sorted_extents = self.extents[self.extent_order]
+        self.sorted_intents = self.intents[self.intent_order]
+
+    @staticmethod
+    def _masks(masks, size):
+        import numpy as np
+
+        return np.array(masks, dtype=np.uint64 if size <= 64 else object)
+
+    def by_extent(self, extents):
+        """Return the featureset indexes with the given extent masks."""
+        import numpy as np
+
+        positions = np.searchsorted(self.sorted_extents, extents)
+        return self.extent_order[positions]
+
+    def by_intent(self, intents):
+        """Return the featureset indexes with the given intent masks."""
+        import numpy as np
+
+        positions = np.searchsorted(self.sorted_intents, intents)
+        return self.intent_order[positions]
+
+
+def mask_arrays(fs):
+    """Return the (cached) :class:`.MaskArrays` of ``fs``."""
+    if fs._mask_arrays is None:
+        fs._mask_arrays = MaskArrays(fs)
+    return fs._mask_arrays
+
+
+def join_pairs(fs, left, right):
+    """Return the join indexes of the featuresets with ``left`` and ``right`` indexes.
+
+    >>> from features import FeatureSystem
+
+    >>> fs = FeatureSystem('plural')
+
+    >>> from_indexes(fs, join_pairs(fs, [fs('1sg').index], [fs('2sg').index]))
+    [FeatureSet('-3 +sg')]
+    """
+    arrays = mask_arrays(fs)
+    return arrays.by_intent(arrays.intents[left] & arrays.intents[right])
+
+
+def meet_pairs(fs, left, right):
+    """Return the meet indexes of the featuresets with ``left`` and ``right`` indexes.
+
+    >>> from features import FeatureSystem
+
+    >>> fs = FeatureSystem('plural')
+
+    >>> from_indexes(fs, meet_pairs(fs, [fs('1').index], [fs('sg').index]))
+    [FeatureSet('+1 +sg')]
+    """
+    arrays = mask_arrays(fs)
+    return arrays.by_extent(arrays.extents[left] & arrays.extents[right])
+
+
+def _reduce_groups(masks, indexes, indptr, identity):
+    import numpy as np
+
+    indexes, indptr = np.asarray(indexes, dtype=np.intp), np.asarray(indptr, dtype=np.intp)
+    values = np.append(masks[indexes], np.array([identity], dtype=masks.dtype))
+    result = np.bitwise_and.reduceat(values, indptr[:-1])
+    result[indptr[:-1] == indptr[1:]] = identity
+    return result
+
+
+def join_groups(fs, indexes, indptr):
+    """Return the join index for each CSR-style group of featureset ``indexes``.
+
+    Group ``i`` consists of ``indexes[indptr[i]:indptr[i + 1]]``.
+
+    >>> from features import FeatureSystem
+
+    >>> fs = FeatureSystem('plural')
+
+    >>> groups = [fs('1sg'), fs('1pl'), fs('3sg'), fs('-1'), fs('-2')]
+
+    >>> from_indexes(fs, join_groups(fs, to_indexes(groups), [0, 3, 5, 5]))
+    [FeatureSet('-2'), FeatureSet(''), FeatureSet('+1 -1 +2 -2 +3 -3 +sg +pl -sg -pl')]
+    """
+    arrays = mask_arrays(fs)
+    intents = _reduce_groups(arrays.intents, indexes, indptr, fs.infimum._intent)
+    return arrays.by_intent(intents)
+
+
+def meet_groups(fs, indexes, indptr):
+    """Return the meet index for each CSR-style group of featureset ``indexes``.
+
+    Group ``i`` consists of ``indexes[indptr[i]:indptr[i + 1]]``.
+
+    >>> from features import FeatureSystem
+
+    >>> fs = FeatureSystem('plural')
+
+    >>> groups = [fs('-1'), fs('-2'), fs('-pl'), fs('1')]
+
+    >>> from_indexes(fs, meet_groups(fs, to_indexes(groups), [0, 3, 4, 4]))
+    [FeatureSet('+3 +sg'), FeatureSet('+1'), FeatureSet('')]
+    """
+    arrays = mask_arrays(fs)
+    extents = _reduce_groups(arrays.extents, indexes, indptr, fs.supremum._extent)
+    return arrays.by_extent(extents)
@@ -1,8 +1,17 @@
 """Retrieve feature system from config file section."""
 
+import collections
 import copyreg
+import errno
+import hashlib
+import os
+import threading
+import weakref
 
 import fileconfig
+import fileconfig.meta
+import fileconfig.stack
+import fileconfig.tools
 
 __all__ = ['Config', 'FeatureSystemMeta', 'FeatureSetMeta']
 
@@ -15,7 +24,81 @@ def register_reduce(mcls):
     return mcls
 
 
-class Config(fileconfig.Stacked):
+class IndexedStackedMeta(fileconfig.meta.StackedMeta):
+    """Index the config files of the stack on first lookup, parse sections on demand.
+
+    Names and aliases are resolved with one mapping over the whole stack.
+    With ``save_index``, the section index is saved beside each config file.
+    """
+
+    save_index = False
+
+    __lock = threading.RLock()
+
+    def __init__(self, name, bases, dct):  # noqa: N804
+        type.__init__(self, name, bases, dct)
+        self._indexed = False
+        self._names = None
+        if self.filename is None:
+            return
+        if not os.path.isabs(self.filename):
+            self.filename = os.path.join(fileconfig.tools.class_path(self), self.filename)
+        self.filename = os.path.realpath(self.filename)
+        self.stack = fileconfig.stack.ConfigStack(self)
+
+    def _load(self):  # noqa: N804
+        if self._names is not None:
+            return
+        with self.__lock:
+            names = {}
+            for cls in self.stack:
+                if not cls.__dict__.get('_indexed'):
+                    cls._index()
+                for name in cls._keys + list(cls._aliases):
+                    names.setdefault(name, cls)
+            self._names = names
+
+    def _index(self):  # noqa: N804
+        if self._pass_notfound and not os.path.exists(self.filename):
+            self._keys, self._aliases, self._kwargs = [], {}, {}
+        else:
+            from . import sections
+
+            index = sections.load(self.filename, self._encoding, save=self.save_index)
+            self._keys, self._aliases, self._kwargs = index.keys, index.aliases, index
+        self._cache = {}
+        self._indexed = True
+
+    def add(self, filename, position=0, caller_steps=1):  # noqa: N804
+        if not os.path.isabs(filename):
+            filename = os.path.join(fileconfig.tools.caller_path(caller_steps), filename)
+        if not self._pass_notfound and not os.path.exists(filename):
+            # fail before inserting, parsing is deferred to the first lookup
+            raise FileNotFoundError(errno.ENOENT, os.strerror(errno.ENOENT), filename)
+        with self.__lock:
+            super().add(filename, position, caller_steps + 1)
+            self._names = None
+
+    def __call__(self, key=DEFAULT):  # noqa: N804
+        if isinstance(key, self):
+            return key
+        self._load()
+        cls = self._names.get(key)
+        if cls is None:
+            raise KeyError(key)
+        with self.__lock:
+            return fileconfig.meta.ConfigMeta.__call__(cls, key)
+
+    def __iter__(self):  # noqa: N804
+        self._load()
+        return super().__iter__()
+
+    def create(self, key=None, **kwargs):  # noqa: N804
+        self._load()
+        return super().create(key, **kwargs)
+
+
+class Config(fileconfig.Stacked, metaclass=IndexedStackedMeta):
     """Define possible feature combinations and their minimal specification."""
 
     filename = 'config.ini'
@@ -34,24 +117,69 @@ class Config(fileconfig.Stacked):
                             else str_maximal.lower() in ('1', 'yes', 'true', 'on'))
         self.description = description.strip() if description is not None else ''
 
+    def fingerprint(self):
+        """Return the hex digest of the feature system definition.
+
+        >>> Config('plural').fingerprint()  # doctest: +ELLIPSIS
+        '...'
+
+        >>> Config('plural').fingerprint() == Config('small').fingerprint()
+        False
+        """
+        digest = hashlib.sha256()
+        for value in (self.context, self.format, str(self.str_maximal)):
+            digest.update(value.encode('utf-8'))
+            digest.update(b'\0')
+        return digest.hexdigest()
+
 
 class FeatureSystemMeta(type):
-    """Idempotently cache and return feature system instances by config."""
+    """Idempotently cache and return feature system instances by config.
+
+    Named systems are cached by their names, unnamed ones by their class and
+    the fingerprint of their config (kept alive while referenced and for the
+    ``unnamed_maxsize`` most recently used ones). Concurrent requests for the
+    same uncached system wait for a single construction.
+    """
+
+    unnamed_maxsize = 32  #: Number of unused unnamed systems to keep alive.
+
+    __map: dict[str, object] = {}
+
+    __unnamed: weakref.WeakValueDictionary[tuple, object] = weakref.WeakValueDictionary()
+
+    __recent: collections.OrderedDict[tuple, object] = collections.OrderedDict()
 
-    __map = {}
+    __building: dict[str | tuple, threading.Lock] = {}
 
-    def __call__(self, config=DEFAULT, string=None):  # noqa: N804
+    __lock = threading.RLock()
+
+    def __call__(self, config=DEFAULT, string=None, **kwargs):  # noqa: N804
         if isinstance(config, self):
             return config
 
-        if isinstance(config, str):
-            config = Config(config)
-
-        if config.key is not None and config.key in self.__map:
-            inst = self.__map[config.key]
-        else:
-            inst = super().__call__(config)
-            self.__map.update(dict.fromkeys(inst._config.names, inst))
+        with self.__lock:
+            if isinstance(config, str):
+                config = Config(config)
+            key = config.key
+            if key is None:
+                key = (self, config.fingerprint())
+            inst = self.__lookup(config.key, key)
+            if inst is None:
+                building = self.__building.setdefault(key, threading.Lock())
+
+        if inst is None:
+            with building:
+                with self.__lock:
+                    inst = self.__lookup(config.key, key)
+                if inst is None:
+                    try:
+                        inst = super().__call__(config, **kwargs)
+                        with self.__lock:
+                            self.__store(inst, key)
+                    finally:
+                        with self.__lock:
+                            self.__building.pop(key, None)
 
         if string is not None:
             if string == -1:  # unpickle set class
@@ -59,6 +187,47 @@ class FeatureSystemMeta(type):
             return inst(string)
         return inst
 
+    def __lookup(self, name, key):  # noqa: N804
+        if name is not None:
+            return self.__map.get(name)
+        inst = self.__unnamed.get(key)
+        if inst is not None:
+            self.__recent[key] = inst
+            self.__recent.move_to_end(key)
+        return inst
+
+    def __store(self, inst, key):  # noqa: N804
+        if inst._config.key is not None:
+            self.__map.update(dict.fromkeys(inst._config.names, inst))
+            return
+        self.__unnamed[key] = self.__recent[key] = inst
+        while len(self.__recent) > self.unnamed_maxsize:
+            self.__recent.popitem(last=False)
+
+    def _restore(self, fingerprint, definition, index=None):  # noqa: N804
+        """Return the unnamed system (or its featureset ``index``) when unpickling.
+
+        Looks up ``fingerprint`` first, builds from ``definition`` (a
+        ``(context, format, str_maximal)`` tuple) only if not registered.
+        """
+        with self.__lock:
+            inst = self.__lookup(None, (self, fingerprint))
+        if inst is None:
+            context, format, str_maximal = definition
+            inst = self(Config.create(context=context, format=format,
+                                      str_maximal=str_maximal))
+        if index is None:
+            return inst
+        elif index == -1:
+            return inst.FeatureSet
+        return inst._featuresets[index]
+
+    def clear_unnamed(self):  # noqa: N804
+        """Drop all cached unnamed feature systems."""
+        with self.__lock:
+            self.__unnamed.clear()
+            self.__recent.clear()
+
 
 @register_reduce
 class FeatureSetMeta(type):
@@ -77,5 +246,5 @@ class FeatureSetMeta(type):
         if self.system is None:
             return self.__name__
         elif self.system.key is None:
-            return self.system.__class__, (self.system._config, -1)
+            return self.system._reduce_unnamed(-1)
         return self.system.__class__, (self.system.key, -1)
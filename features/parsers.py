@@ -72,6 +72,12 @@ class Parser(object):
     >>> parse('1PL')
     ['+1', 'pl']
 
+    >>> parse('-1  +PL')
+    ['-1', 'pl']
+
+    >>> list(parse.parse_many(['1sg', '-1', '1sg']))
+    [['+1', 'sg'], ['-1'], ['+1', 'sg']]
+
     >>> parse('spam')
     Traceback (most recent call last):
         ...
@@ -90,8 +96,39 @@ class Parser(object):
         pattern = r'(?i)(?:{})'.format('|'.join(regexes))
         self.features = features
         self.regex = re.compile(pattern)
+        self._tokens = self._make_tokens(features)
+
+    def _make_tokens(self, features):
+        """Map lowercase space-separated tokens to their (single) feature."""
+        tokens = {}
+        for name in tools.uniqued(map(remove_sign, features)):
+            for token in (name, f'+{name}', f'-{name}'):
+                try:
+                    matched = self._parse(token)
+                except ValueError:
+                    continue
+                if len(matched) == 1:
+                    tokens[token.lower()] = matched[0]
+        return tokens
 
     def __call__(self, string):
+        tokens = self._tokens
+        try:
+            return [tokens[t] for t in string.lower().split(' ') if t]
+        except KeyError:
+            return self._parse(string)
+
+    def parse_many(self, strings, cache_size=1024):
+        """Yield the features of each string (memoizing up to ``cache_size`` strings)."""
+        seen = tools.LRUCache(cache_size)
+        for string in strings:
+            features = seen.get(string)
+            if features is None:
+                features = self(string)
+                seen[string] = features
+            yield features[:]
+
+    def _parse(self, string):
         indexes = (ma.lastindex - 1 for ma in self.regex.finditer(string))
         features = list(map(self.features.__getitem__, indexes))
 
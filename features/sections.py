@@ -0,0 +1,159 @@
+"""Index config file sections by name to parse them on demand."""
+
+import codecs
+import configparser
+import json
+import logging
+import os
+import re
+import tempfile
+
+__all__ = ['Index', 'scan', 'load']
+
+VERSION = 1
+
+SUFFIX = '.idx'
+
+DEFAULT_SECTION = 'DEFAULT'
+
+SECTION = re.compile(rb'^\[(?P<name>.+)\][ \t]*\r?$', flags=re.MULTILINE)
+
+OPTION = (rb'^%s[ \t]*[=:][ \t]*(?P<value>.*(?:\r?\n[ \t]+\S.*)*)')
+
+ALIASES = re.compile(OPTION % rb'aliases', flags=re.MULTILINE | re.IGNORECASE)
+
+INHERITS = re.compile(OPTION % rb'inherits', flags=re.MULTILINE | re.IGNORECASE)
+
+log = logging.getLogger(__name__)
+
+
+def _split_aliases(aliases):
+    return aliases.replace(',', ' ').split()
+
+
+def scan(data, encoding='utf-8'):
+    """Return the section index entries of the config file contents ``data``.
+
+    >>> entries = scan(b'[spam]\\naliases = ham, eggs\\n\\n[eggs]\\ninherits = spam\\n')
+
+    >>> entries['keys'], entries['spans']
+    (['spam', 'eggs'], {'spam': [0, 28], 'eggs': [28, 51]})
+
+    >>> entries['aliases'], entries['inherits']
+    ({'ham': 'spam', 'eggs': 'spam'}, {'eggs': 'spam'})
+    """
+    entries = {'keys': [], 'spans': {}, 'aliases': {}, 'inherits': {}, 'default': None}
+    offset = len(codecs.BOM_UTF8) if data.startswith(codecs.BOM_UTF8) else 0
+    headers = list(SECTION.finditer(data[offset:]))
+    ends = [h.start() for h in headers[1:]] + [len(data) - offset]
+    for header, end in zip(headers, ends):
+        name = header.group('name').decode(encoding).strip()
+        span = [offset + header.start(), offset + end]
+        if name == DEFAULT_SECTION:
+            entries['default'] = span
+            continue
+        if name in entries['spans']:
+            raise configparser.DuplicateSectionError(name)
+        entries['keys'].append(name)
+        entries['spans'][name] = span
+
+        body = data[offset + header.end():offset + end]
+        if (match := ALIASES.search(body)) is not None:
+            aliases = _split_aliases(match.group('value').decode(encoding))
+            entries['aliases'].update((a, name) for a in aliases)
+        if (match := INHERITS.search(body)) is not None:
+            entries['inherits'][name] = match.group('value').decode(encoding).strip()
+    return entries
+
+
+class Index(object):
+    """Mapping of section names to keyword arguments parsed on first access.
+
+    Mimics the ``_kwargs`` dict of ``fileconfig`` classes (``pop()`` returns
+    the arguments of one section, reading only its span of the file).
+    """
+
+    def __init__(self, filename, encoding, entries):
+        self.filename = filename
+        self.encoding = encoding
+        self.keys = entries['keys']
+        self.aliases = entries['aliases']
+        self._spans = entries['spans']
+        self._pending = set(self._spans)
+        self._inherits = entries['inherits']
+        self._default = entries['default']
+
+    def __contains__(self, key):
+        return key in self._pending
+
+    def __len__(self):
+        return len(self._pending)
+
+    def _read(self, f, span):
+        start, end = span
+        f.seek(start)
+        return f.read(end - start).decode(self.encoding)
+
+    def pop(self, key):
+        """Parse and return the keyword arguments of section ``key`` (once)."""
+        self._pending.remove(key)
+        with open(self.filename, 'rb') as f:
+            chunks = [self._read(f, self._spans[key])]
+            parent = self._inherits.get(key)
+            if parent is not None:
+                chunks.append(self._read(f, self._spans[parent]))
+            if self._default is not None:
+                chunks.append(self._read(f, self._default))
+
+        parser = configparser.ConfigParser()
+        parser.read_string(''.join(reversed(chunks)), self.filename)
+
+        kwargs = dict(parser.items(key), key=key)
+        if 'aliases' in kwargs:
+            aliases = kwargs.pop('aliases')
+            if aliases.strip():
+                kwargs['aliases'] = _split_aliases(aliases)
+        if 'inherits' in kwargs:
+            kwargs = dict(((k, v) for k, v in parser.items(kwargs['inherits'])
+                           if k != 'aliases'), **kwargs)
+        return kwargs
+
+
+def load(filename, encoding=None, save=False):
+    """Return the :class:`.Index` of ``filename`` (reusing/writing a saved one)."""
+    encoding = 'utf-8' if encoding in (None, 'utf-8-sig') else encoding
+    stat = os.stat(filename)
+    path = filename + SUFFIX
+    stamp = [VERSION, stat.st_size, stat.st_mtime_ns]
+
+    entries = None
+    if save:
+        try:
+            with open(path, encoding='utf-8') as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            pass
+        else:
+            if saved.get('stamp') == stamp:
+                entries = saved['entries']
+
+    if entries is None:
+        with open(filename, 'rb') as f:
+            entries = scan(f.read(), encoding)
+        if save:
+            _dump(path, {'stamp': stamp, 'entries': entries})
+    return Index(filename, encoding, entries)
+
+
+def _dump(path, data):
+    try:
+        fd, tmp = tempfile.mkstemp(suffix=SUFFIX, dir=os.path.dirname(path))
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(tmp, path)
+        except BaseException:
+            os.remove(tmp)
+            raise
+    except OSError:
+        log.warning('cannot write config index %r', path, exc_info=True)
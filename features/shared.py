@@ -0,0 +1,511 @@
+"""Export built feature system tables to shared memory or a file and attach them."""
+
+import bisect
+import json
+import mmap
+import os
+import sys
+import tempfile
+
+from . import bases
+from . import lattices
+from . import parsers
+
+__all__ = ['Tables', 'SharedSystem', 'SharedFeatureSet', 'export', 'attach']
+
+MAGIC = b'FEATSHM'
+
+VERSION = 1
+
+_HEADER = len(MAGIC) + 1 + 4  # magic, version, metadata size
+
+_ARRAYS = ('extents', 'intents', 'rows', 'intent_order', 'dindex',
+           'upper_indptr', 'upper', 'lower_indptr', 'lower',
+           'string_indptr', 'strings')
+
+
+def _uint32(values):
+    return b''.join(v.to_bytes(4, sys.byteorder) for v in values)
+
+
+def _indptr(groups):
+    result = [0]
+    for g in groups:
+        result.append(result[-1] + len(g))
+    return result
+
+
+def serialize(fs):
+    """Return the bytes of the tables of the built feature system ``fs``."""
+    config = fs._config
+    extent_size = (len(fs.context.objects) + 7) // 8
+    intent_size = (len(fs.context.properties) + 7) // 8
+    upper = [[n.index for n in f.concept.upper_neighbors] for f in fs]
+    lower = [[n.index for n in f.concept.lower_neighbors] for f in fs]
+    strings = [f.string.encode('utf-8') for f in fs]
+    intent_order = sorted(range(len(fs)), key=lambda i: fs[i]._intent)
+
+    arrays = {'extents': b''.join(f._extent.to_bytes(extent_size, 'little') for f in fs),
+              'intents': b''.join(f._intent.to_bytes(intent_size, 'little') for f in fs),
+              'rows': b''.join(int(r).to_bytes(intent_size, 'little')
+                               for r in fs.context._intents),
+              'intent_order': _uint32(intent_order),
+              'dindex': _uint32(f.concept.dindex for f in fs),
+              'upper_indptr': _uint32(_indptr(upper)),
+              'upper': _uint32(i for u in upper for i in u),
+              'lower_indptr': _uint32(_indptr(lower)),
+              'lower': _uint32(i for neighbors in lower for i in neighbors),
+              'string_indptr': _uint32(_indptr(strings)),
+              'strings': b''.join(strings)}
+
+    meta = {'key': config.key,
+            'fingerprint': config.fingerprint(),
+            'context': config.context,
+            'format': config.format,
+            'str_maximal': config.str_maximal,
+            'objects': list(fs.context.objects),
+            'properties': list(fs.context.properties),
+            'byteorder': sys.byteorder,
+            'extent_size': extent_size,
+            'intent_size': intent_size,
+            'arrays': {}}
+
+    offset = 0
+    for name in _ARRAYS:  # relative to the 8-byte aligned end of the metadata
+        meta['arrays'][name] = [offset, len(arrays[name])]
+        offset += len(arrays[name]) + -len(arrays[name]) % 8
+    metadata = json.dumps(meta, sort_keys=True).encode('utf-8')
+    metadata += b' ' * (-(_HEADER + len(metadata)) % 8)
+
+    chunks = [MAGIC, bytes([VERSION]), len(metadata).to_bytes(4, 'little'), metadata]
+    for name in _ARRAYS:
+        chunks.append(arrays[name])
+        chunks.append(b'\0' * (-len(arrays[name]) % 8))
+    return b''.join(chunks)
+
+
+class Tables(object):
+    """Read-only zero-copy view of exported feature system tables.
+
+    Use as a context manager or call :meth:`close` to release the buffer.
+    """
+
+    def __init__(self, buffer, handle=None, name=None):
+        self.name = name
+        self._handle = handle
+        self._views = [memoryview(buffer)]
+        view = self._views[0]
+        if bytes(view[:len(MAGIC)]) != MAGIC or view[len(MAGIC)] != VERSION:
+            self.close()
+            raise ValueError(f'not a feature system tables buffer: {name!r}')
+        size = int.from_bytes(view[len(MAGIC) + 1:_HEADER], 'little')
+        self.meta = json.loads(bytes(view[_HEADER:_HEADER + size]))
+        base = _HEADER + size
+        if self.meta['byteorder'] != sys.byteorder:
+            self.close()
+            raise ValueError(f'tables byte order {self.meta["byteorder"]!r}'
+                             f' does not match {sys.byteorder!r}')
+
+        for name, (offset, length) in self.meta['arrays'].items():
+            array = view[base + offset:base + offset + length]
+            if name not in ('extents', 'intents', 'rows', 'strings'):  # uint32
+                array = array.cast('I')
+            self._views.append(array)
+            setattr(self, f'_{name}', array)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return len(self._string_indptr) - 1
+
+    def extent(self, index):
+        """Return the extent bitmask of the featureset ``index``."""
+        size = self.meta['extent_size']
+        return int.from_bytes(self._extents[index * size:(index + 1) * size], 'little')
+
+    def intent(self, index):
+        """Return the intent bitmask of the featureset ``index``."""
+        size = self.meta['intent_size']
+        return int.from_bytes(self._intents[index * size:(index + 1) * size], 'little')
+
+    def row(self, index):
+        """Return the intent bitmask of the context object ``index``."""
+        size = self.meta['intent_size']
+        return int.from_bytes(self._rows[index * size:(index + 1) * size], 'little')
+
+    def find(self, intent):
+        """Return the index of the featureset with the ``intent`` bitmask (or ``None``)."""
+        order = self._intent_order
+        i = bisect.bisect_left(order, intent, key=self.intent)
+        if i < len(order) and self.intent(order[i]) == intent:
+            return order[i]
+        return None
+
+    def dindex(self, index):
+        """Return the position of the featureset ``index`` in longlex order."""
+        return self._dindex[index]
+
+    def upper_neighbors(self, index):
+        """Return the upper neighbor indexes of the featureset ``index``."""
+        return tuple(self._upper[self._upper_indptr[index]:self._upper_indptr[index + 1]])
+
+    def lower_neighbors(self, index):
+        """Return the lower neighbor indexes of the featureset ``index``."""
+        return tuple(self._lower[self._lower_indptr[index]:self._lower_indptr[index + 1]])
+
+    def string(self, index):
+        """Return the minimal feature string of the featureset ``index``."""
+        start, stop = self._string_indptr[index], self._string_indptr[index + 1]
+        return str(self._strings[start:stop], 'utf-8')
+
+    def context(self):
+        """Return a new ``concepts.Context`` with the lattice from the tables."""
+        import concepts
+
+        objects, properties = self.meta['objects'], self.meta['properties']
+        bools = [tuple(bool(row >> j & 1) for j in range(len(properties)))
+                 for row in map(self.row, range(len(objects)))]
+        context = concepts.Context(objects, properties, bools)
+        lattice = [(lattices.members(self.extent(i)), lattices.members(self.intent(i)),
+                    self.upper_neighbors(i), self.lower_neighbors(i))
+                   for i in range(len(self))]
+        context.lattice = concepts.lattices.Lattice._fromlist(context, lattice, False)
+        return context
+
+    def strings(self):
+        """Return the list of minimal feature strings."""
+        return list(map(self.string, range(len(self))))
+
+    def close(self):
+        """Release the buffer (the exporter keeps shared memory until :meth:`unlink`)."""
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        if self._handle is not None:
+            self._handle.close()
+
+    def unlink(self):
+        """Remove the shared memory block or file."""
+        if isinstance(self._handle, mmap.mmap):
+            os.remove(self.name)
+        else:
+            self._handle.unlink()
+            _exported.discard(self.name)
+
+
+class SharedSystem(object):
+    """Read-only feature system answering queries from attached :class:`.Tables`.
+
+    Featuresets are created on access as :class:`.SharedFeatureSet` views,
+    extents, intents, neighbors, and strings are read from the buffer.
+    Use as a context manager or call :meth:`close` to release the tables.
+    """
+
+    def __init__(self, tables):
+        meta = tables.meta
+        self.tables = tables  #: The underlying :class:`.Tables`.
+        self.key = meta['key']  #: The name of the exported feature system.
+        self.parse = parsers.Parser(meta['properties'])
+        self._str_maximal = meta['str_maximal']
+        self._property_indexes = {p: i for i, p in enumerate(meta['properties'])}
+        self._property_extents = [0] * len(meta['properties'])
+        for o in range(len(meta['objects'])):
+            for p in lattices.members(tables.row(o)):
+                self._property_extents[p] |= 1 << o
+        self._len = len(tables)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Release the underlying tables."""
+        self.tables.close()
+
+    def __repr__(self):
+        if self.key is None:
+            return (f'<{self.__class__.__name__} object'
+                    f' of {len(self.atoms)} atoms {self._len} featuresets'
+                    f' at {id(self):#x}>')
+        return (f'<{self.__class__.__name__}({self.key!r})'
+                f' of {len(self.atoms)} atoms {self._len} featuresets>')
+
+    def __call__(self, string='', allow_invalid=False):
+        """Return the featureset from parsed feature ``string`` (or sequence)."""
+        if isinstance(string, SharedFeatureSet) and string.system is self:
+            return string
+        features = self.parse(string) if isinstance(string, str) else string
+        indexes = self._property_indexes
+        extent = self.supremum._extent
+        for f in features:
+            extent &= self._property_extents[indexes[f]]
+        index = self._closure(extent)
+        if index == 0 and not allow_invalid:
+            raise ValueError(f'{string!r} ({features}) is not'
+                             f' a valid feature set in {self!r}.')
+        return self[index]
+
+    def _closure(self, extent):
+        intent = (1 << len(self._property_extents)) - 1
+        for o in lattices.members(extent):
+            intent &= self.tables.row(o)
+        return self.tables.find(intent)
+
+    def __getitem__(self, index):
+        """Return the feature set with the given ``index``."""
+        if index < 0:
+            index += self._len
+        if not 0 <= index < self._len:
+            raise IndexError(index)
+        return SharedFeatureSet(self, index)
+
+    def __iter__(self):
+        """Yield all feature sets."""
+        return map(self.__getitem__, range(self._len))
+
+    def __len__(self):
+        """Return the number of feature sets."""
+        return self._len
+
+    def __contains__(self, featureset):
+        """Return ``True`` iff ``featureset`` is a view on this system."""
+        return isinstance(featureset, SharedFeatureSet) and featureset.system is self
+
+    @property
+    def infimum(self):
+        """The systems most specific feature set."""
+        return self[0]
+
+    @property
+    def supremum(self):
+        """The systems most general feature set."""
+        return self[-1]
+
+    @property
+    def atoms(self):
+        """The minimal non-infimum featuresets."""
+        return self.infimum.upper_neighbors
+
+    def join(self, featuresets):
+        """Return the nearest featureset that subsumes all given ones."""
+        intent = (1 << len(self._property_extents)) - 1
+        for f in featuresets:
+            intent &= f._intent
+        return self[self.tables.find(intent)]
+
+    def meet(self, featuresets):
+        """Return the nearest featureset that implies all given ones."""
+        extent = self.supremum._extent
+        for f in featuresets:
+            extent &= f._extent
+        return self[self._closure(extent)]
+
+    def upset_indexes(self, featuresets):
+        """Return the ascending indexes of all featuresets that subsume any of the given ones."""
+        return lattices.members(self._reachable(featuresets, self.tables.upper_neighbors))
+
+    def downset_indexes(self, featuresets):
+        """Return the indexes of all featuresets that imply any of the given ones.
+
+        Ordered from the most general to the most specific (``dindex``).
+        """
+        mask = self._reachable(featuresets, self.tables.lower_neighbors)
+        return tuple(sorted(lattices.members(mask), key=self.tables.dindex))
+
+    def _reachable(self, featuresets, neighbors):
+        mask = 0
+        stack = [f.index for f in featuresets]
+        while stack:
+            index = stack.pop()
+            if not mask >> index & 1:
+                mask |= 1 << index
+                stack.extend(neighbors(index))
+        return mask
+
+    def upset_union(self, featuresets):
+        """Yield all featuresets that subsume any of the given ones."""
+        return map(self.__getitem__, self.upset_indexes(featuresets))
+
+    def downset_union(self, featuresets):
+        """Yield all featuresets that imply any of the given ones."""
+        return map(self.__getitem__, self.downset_indexes(featuresets))
+
+
+class SharedFeatureSet(object):
+    """Featureset view on a :class:`.SharedSystem` (equal if same system and index).
+
+    Supports the comparisons and operations of :class:`.bases.FeatureSet`.
+    """
+
+    __slots__ = ('system', 'index')
+
+    def __init__(self, system, index):
+        self.system = system
+        self.index = index
+
+    @property
+    def _extent(self):
+        return self.system.tables.extent(self.index)
+
+    @property
+    def _intent(self):
+        return self.system.tables.intent(self.index)
+
+    @property
+    def string(self):
+        """Space-concatenated minimal features."""
+        return self.system.tables.string(self.index)
+
+    @property
+    def string_maximal(self):
+        """All features space-concatenated."""
+        properties = self.system.tables.meta['properties']
+        return ' '.join(properties[p] for p in lattices.members(self._intent))
+
+    @property
+    def string_extent(self):
+        """Space-concatenated extent labels."""
+        objects = self.system.tables.meta['objects']
+        return ' '.join(objects[o] for o in lattices.members(self._extent))
+
+    def __repr__(self):
+        return f'FeatureSet({self.string!r})'
+
+    def __str__(self):
+        if self.system._str_maximal:
+            return self.__strmax__()
+        return f'[{self.string}]'
+
+    def __strmax__(self):
+        return f'[{self.string_maximal}]'
+
+    def __eq__(self, other):
+        if not isinstance(other, SharedFeatureSet):
+            return NotImplemented
+        return self.system is other.system and self.index == other.index
+
+    def __hash__(self):
+        return hash((id(self.system), self.index))
+
+    def __bool__(self):
+        """Return ``True`` iff the set has features."""
+        return self.index != len(self.system) - 1
+
+    @property
+    def atoms(self):
+        """The subsumed atoms."""
+        extent = self._extent
+        return tuple(a for a in self.system.atoms if extent | a._extent == extent)
+
+    @property
+    def upper_neighbors(self):
+        """The directly implied neighbors."""
+        return tuple(map(self.system.__getitem__,
+                         self.system.tables.upper_neighbors(self.index)))
+
+    @property
+    def lower_neighbors(self):
+        """The directly subsumed neighbors."""
+        return tuple(map(self.system.__getitem__,
+                         self.system.tables.lower_neighbors(self.index)))
+
+    def upset(self):
+        """Return the list of implied neighbors (including self)."""
+        return list(self.system.upset_union((self,)))
+
+    def downset(self):
+        """Return the list of subsumed neighbors (including self)."""
+        return list(self.system.downset_union((self,)))
+
+    subsumes = bases.FeatureSet.subsumes
+    implies = bases.FeatureSet.implies
+    properly_subsumes = bases.FeatureSet.properly_subsumes
+    properly_implies = bases.FeatureSet.properly_implies
+
+    __le__ = subsumes
+    __ge__ = implies
+    __lt__ = properly_subsumes
+    __gt__ = properly_implies
+
+    def intersection(self, other):
+        """Return the closest implied neighbor (generalization, join)."""
+        return self.system.join((self, other))
+
+    def union(self, other):
+        """Return the closest subsumed neighbor (unification, meet)."""
+        return self.system.meet((self, other))
+
+    __mod__ = intersection
+    __xor__ = union
+
+    incompatible_with = bases.FeatureSet.incompatible_with
+    complement_of = bases.FeatureSet.complement_of
+    subcontrary_with = bases.FeatureSet.subcontrary_with
+    orthogonal_to = bases.FeatureSet.orthogonal_to
+
+
+_exported: set[str] = set()  # names of blocks created by this process (or its fork parent)
+
+
+def _shared_memory(name, create=False, size=0):
+    from multiprocessing import shared_memory
+
+    if create:
+        shm = shared_memory.SharedMemory(name, create=True, size=size)
+        _exported.add(shm.name)
+        return shm
+    if sys.version_info >= (3, 13):  # pragma: no cover
+        return shared_memory.SharedMemory(name, track=False)
+    shm = shared_memory.SharedMemory(name)
+    if shm.name not in _exported:
+        # attaching must not make the resource tracker unlink the block at exit
+        from multiprocessing import resource_tracker
+
+        resource_tracker.unregister(shm._name, 'shared_memory')
+    return shm
+
+
+def export(fs, name=None, path=None):
+    """Write the tables of ``fs`` to shared memory ``name`` or the file ``path``.
+
+    Return the exported :class:`.Tables` (``name`` is set when ``None``).
+    The caller owns the block: :meth:`.Tables.unlink` it when done.
+    """
+    data = serialize(fs)
+    if path is not None:
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp = tempfile.mkstemp(dir=directory)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            os.remove(tmp)
+            raise
+        return _open_file(path)
+
+    shm = _shared_memory(name, create=True, size=len(data))
+    shm.buf[:len(data)] = data
+    return Tables(shm.buf, shm, shm.name)
+
+
+def _open_file(path):
+    with open(path, 'rb') as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return Tables(buffer, buffer, path)
+
+
+def attach(name=None, path=None):
+    """Return the :class:`.Tables` in shared memory ``name`` or the file ``path``."""
+    if (name is None) == (path is None):
+        raise TypeError('need either name or path')
+    if path is not None:
+        return _open_file(path)
+    shm = _shared_memory(name)
+    return Tables(shm.buf, shm, shm.name)
@@ -0,0 +1,82 @@
+"""Persist built feature system lattices in a cache directory."""
+
+import io
+import logging
+import os
+import pickle
+import tempfile
+
+__all__ = ['filepath', 'load', 'dump']
+
+MAGIC = b'FEATSYS'
+
+VERSION = 1
+
+SUFFIX = '.fs'
+
+log = logging.getLogger(__name__)
+
+
+def filepath(config, directory):
+    """Return the cache file path for ``config`` in ``directory``."""
+    return os.path.join(directory, config.fingerprint() + SUFFIX)
+
+
+class _Unpickler(pickle.Unpickler):
+    """Unpickle builtin containers and scalars only."""
+
+    def find_class(self, module, name):
+        raise pickle.UnpicklingError(f'forbidden global: {module}.{name}')
+
+
+def load(config, directory):
+    """Return ``(context, strings)`` from the cache or ``(None, None)``."""
+    import concepts
+
+    path = filepath(config, directory)
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except FileNotFoundError:
+        return None, None
+
+    header = MAGIC + bytes([VERSION])
+    if not data.startswith(header):
+        log.debug('ignore %r with unknown format', path)
+        return None, None
+
+    try:
+        objects, properties, rows, lattice, strings = _Unpickler(
+            io.BytesIO(data[len(header):])).load()
+        context = concepts.Context.fromdict({'objects': objects,
+                                             'properties': properties,
+                                             'context': rows,
+                                             'lattice': lattice})
+    except Exception:
+        log.warning('ignore invalid cache file %r', path, exc_info=True)
+        return None, None
+    return context, strings
+
+
+def dump(config, directory, context, strings):
+    """Write the built lattice of ``context`` with the minimal ``strings``.
+
+    Failures are logged, the cache is an optimization only.
+    """
+    path = filepath(config, directory)
+    try:
+        d = context.todict()
+        data = (d['objects'], d['properties'], d['context'], d['lattice'], strings)
+        payload = pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(suffix=SUFFIX, dir=directory)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(MAGIC + bytes([VERSION]))
+                f.write(payload)
+            os.replace(tmp, path)
+        except BaseException:
+            os.remove(tmp)
+            raise
+    except Exception:
+        log.warning('cannot write cache file %r', path, exc_info=True)
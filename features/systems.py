@@ -1,11 +1,15 @@
 """Build lattice of possible feature sets from FCA concept lattice."""
 
-import concepts
+import array
+import functools
+import threading
+import time
 
 from . import bases
+from . import lattices
 from . import meta
 from . import parsers
-from . import visualize
+from . import tools
 
 __all__ = ['FeatureSystem']
 
@@ -71,72 +75,361 @@ class FeatureSystem(metaclass=meta.FeatureSystemMeta):
     True
 
     >>> fs.atoms  # doctest: +NORMALIZE_WHITESPACE
-    [FeatureSet('+1 +sg'), FeatureSet('+1 +pl'),
+    (FeatureSet('+1 +sg'), FeatureSet('+1 +pl'),
      FeatureSet('+2 +sg'), FeatureSet('+2 +pl'),
-     FeatureSet('+3 +sg'), FeatureSet('+3 +pl')]
+     FeatureSet('+3 +sg'), FeatureSet('+3 +pl'))
 
     >>> fs('+1 -1')  # doctest: +ELLIPSIS
     Traceback (most recent call last):
         ...
     ValueError: '+1 -1' (['+1', '-1']) is not a valid feature set in ...
 
+    >>> fs.conflicts('-1 -2 -3 +sg')
+    ('-1', '-2', '-3')
+
+
+    >>> list(fs.many(['1sg', '3pl', '1sg']))
+    [FeatureSet('+1 +sg'), FeatureSet('+3 +pl'), FeatureSet('+1 +sg')]
+
+    >>> list(fs.validate_many(['1sg', '+sg +pl', '1sg']))
+    [(), ('+sg', '+pl'), ()]
+
 
     >>> fs.join([fs('1sg'), fs('1pl'), fs('3sg')])
     FeatureSet('-2')
 
     >>> fs.meet([fs('-1'), fs('-2'), fs('-pl')])
     FeatureSet('+3 +sg')
+
+
+    >>> list(fs.select(subsumes='1sg', compatible_with='2', extent_size=range(3)))
+    [FeatureSet('-3 +sg')]
     """
 
     FeatureSet = bases.FeatureSet
 
-    def __init__(self, config):
-        self._config = config
+    lookup_tables = False  #: Precompute join/meet tables (``True``, ``'lazy'``, or ``False``).
 
-        context = concepts.Context.fromstring(config.context, frmat=config.format)
-        if (len(context.objects) != len(context.lattice.atoms)
-            or any((o,) != a.extent
-                   for o, a in zip(context.objects, context.lattice.atoms,
-                                   strict=True))):
-            raise ValueError('context does not allow to refer'
-                             f' to each individual object: {context!r}')
+    lookup_tables_max_bytes = 2 ** 24  #: Memory cap for the join/meet tables.
+
+    cache_size = 1024  #: Maximal number of memoized string lookups (``0``: disabled).
+
+    cache_directory = None  #: Directory to persist built lattices in (``None``: disabled).
+
+    lazy = False  #: Defer building the lattice until its first use.
+
+    lattice_builder = 'auto'  #: ``'concepts'``, ``'bitsets'``, or ``'auto'`` (by context size).
+
+    lattice_workers = 1  #: Processes for the ``'bitsets'`` builder (``None``: one per CPU).
+
+    instrumentation = False  #: Record operation timings from construction (see :meth:`instrument`).
+
+    _lazy_attributes = frozenset({'context', 'lattice', 'parse', 'infimum', 'supremum',
+                                  '_cache', '_featuresets', '_joins', '_meets',
+                                  '_mask_arrays', '_parse', '_closure',
+                                  '_upsets', '_downsets', '_dorder', '_keys',
+                                  '_property_masks', '_property_extents', '_rows',
+                                  '_pair_conflicts', '_object_sets', '_size_sets'})
 
+    _stats = None
+
+    def __init__(self, config, _prebuilt=None):
+        self._config = config
+        self._prebuilt = _prebuilt
+        self._build_lock = threading.Lock()
+        self._fingerprint = None
         self.key = config.key  #: The unique name of the feature system.
         self.description = config.description  #: A description of the feature system.
-        self.context = context  #: The FCA context defining the feature system.
-        self.lattice = context.lattice  #: The corresponding FCA lattice of the feature system.
-        self.parse = parsers.Parser(context.properties)
 
         base = self.FeatureSet
-        cls = type(base.__name__, (base,), {'system': self})
+        cls = type(base.__name__, (base,), {'__slots__': (), 'system': self})
         if config.str_maximal:
             cls.__str__ = cls.__strmax__
+        self.FeatureSet = cls
+
+        if not self.lazy:
+            self._build()
+
+    def __getattr__(self, name):
+        if name not in self._lazy_attributes or '_featuresets' in self.__dict__:
+            raise AttributeError(f'{self.__class__.__name__!r} object'
+                                 f' has no attribute {name!r}')
+        with self._build_lock:
+            if '_featuresets' not in self.__dict__:
+                self._build()
+        return getattr(self, name)
+
+    def _build(self):
+        start = time.perf_counter()
+        config = self._config
+
+        if self._prebuilt is not None:
+            (context, strings), self._prebuilt = self._prebuilt, None
+            self._check_context(context)
+            loaded = False
+        elif self.cache_directory is not None:
+            from . import storage
+
+            context, strings = storage.load(config, self.cache_directory)
+            loaded = context is not None
+        else:
+            context = strings = None
+            loaded = False
+
+        if context is None:
+            context = self._make_context(config)
+
+        self.context = context  #: The FCA context defining the feature system.
+        self.lattice = context.lattice  #: The corresponding FCA lattice of the feature system.
+        self.parse = parsers.Parser(context.properties)
+        self._parse, self._closure = self.parse, self._close
+        self._property_masks = {p: 1 << i for i, p in enumerate(context.properties)}
+        self._property_extents = [int(e) for e in context._extents]
+        self._rows = [int(r) for r in context._intents]
+        self._cache = tools.LRUCache(self.cache_size)
 
+        cls = self.FeatureSet
         create = super(cls.__class__, cls).__call__
-        self._featuresets = featuresets = list(map(create, self.lattice))
+        if strings is None:
+            featuresets = list(map(create, self.lattice))
+        else:
+            featuresets = list(map(create, self.lattice, strings))
+        if self.cache_directory is not None and not loaded:
+            from . import storage
+
+            storage.dump(config, self.cache_directory, context,
+                         [f.string for f in featuresets])
         cls._sibling = featuresets.__getitem__
 
-        self.FeatureSet = cls
         self.infimum = featuresets[0]  #: The systems most specific feature set.
         self.supremum = featuresets[-1]  #: The systems most general feature set.
 
+        self._joins = self._meets = None if self.lookup_tables else ()
+        self._mask_arrays = None
+        self._upsets = self._downsets = self._dorder = None
+        self._keys = self._pair_conflicts = None
+        self._object_sets = self._size_sets = None
+        self._featuresets = featuresets
+        if self.lookup_tables is True:
+            self.build_tables()
+        if self.instrumentation:
+            self.instrument().record('build', time.perf_counter() - start)
+
+    @classmethod
+    def _make_context(cls, config):
+        import concepts
+
+        context = concepts.Context.fromstring(config.context, frmat=config.format)
+        builder = cls.lattice_builder
+        if builder == 'auto':
+            auto = len(context.objects) >= lattices.AUTO_MIN_OBJECTS
+            builder = 'bitsets' if auto else 'concepts'
+        if builder == 'bitsets':
+            context.lattice = lattices.build(context, workers=cls.lattice_workers)
+        elif builder != 'concepts':
+            raise ValueError(f'unknown lattice_builder: {builder!r}')
+        cls._check_context(context)
+        return context
+
+    @staticmethod
+    def _check_context(context):
+        if (len(context.objects) != len(context.lattice.atoms)
+            or any((o,) != a.extent
+                   for o, a in zip(context.objects, context.lattice.atoms,
+                                   strict=True))):
+            raise ValueError('context does not allow to refer'
+                             f' to each individual object: {context!r}')
+
+    def extend(self, objects=(), properties=()):
+        """Return a new feature system with additional objects and/or properties.
+
+        Args:
+            objects: Iterable of ``(object, features)`` pairs (new context rows).
+            properties: Iterable of ``(property, objects)`` pairs (new context
+                columns, ``objects`` may include new ones).
+
+        The lattice is derived from the current one instead of being rebuilt,
+        minimal feature strings that cannot have changed are reused.
+        """
+        context, strings = lattices.extend(self, objects, properties)
+        config = meta.Config.create(context=context.tostring(),
+                                    str_maximal=self._config.str_maximal)
+        return self.__class__(config, _prebuilt=(context, strings))
+
     def __call__(self, string='', allow_invalid=False):
         """Idempotently return featureset from parsed feature ``string``."""
         if isinstance(string, str):
-            features = self.parse(string)
+            result = self._cache.get(string)
+            if result is None:
+                features = self._parse(string)
+                result = self._cache[string] = self._lookup(features)
         elif isinstance(string, self.FeatureSet):
             return string
         else:
             features = string
-
-        concept = self.lattice(features)
-        result = self._featuresets[concept.index]
+            result = self._lookup(features)
 
         if result is self.infimum and not allow_invalid:
+            if self._stats is not None:
+                self._stats.reject()
+            if isinstance(string, str):
+                features = self.parse(string)
+            conflicts = self._conflicts(features)
+            conflicts = f' (conflicting: {list(conflicts)})' if conflicts else ''
             raise ValueError(f'{string!r} ({features}) is not'
-                             f' a valid feature set in {self!r}.')
+                             f' a valid feature set in {self!r}{conflicts}.')
         return result
 
+    def _lookup(self, features):
+        keys = self._keys
+        if keys is None:
+            keys = self._key_table()
+        masks = self._property_masks
+        mask = 0
+        for f in features:
+            mask |= masks[f]
+        index = keys.get(mask)
+        if index is None:
+            index = self._closure(mask)
+        return self._featuresets[index]
+
+    def _key_table(self):
+        """Map the minimal and maximal intent masks to the featureset indexes."""
+        masks = self._property_masks
+        keys = {f._intent: f.index for f in self._featuresets}
+        for f in self._featuresets:
+            mask = 0
+            for p in f.string.split():
+                mask |= masks[p]
+            keys[mask] = f.index
+        self._keys = keys
+        return keys
+
+    def _close(self, mask):
+        """Return the featureset index of the closure of the intent ``mask``."""
+        extent = (1 << len(self._rows)) - 1
+        for p in lattices.members(mask):
+            extent &= self._property_extents[p]
+        if not extent:  # no common object: reject without computing the intent
+            return self.infimum.index
+        intent = (1 << len(self._property_extents)) - 1
+        for o in lattices.members(extent):
+            intent &= self._rows[o]
+        return self._keys[intent]
+
+    def conflicts(self, features):
+        """Return a minimal tuple of the given ``features`` that no object has in common.
+
+        ``features`` can be a string or a sequence, the result is empty for
+        features that are compatible.
+        """
+        if isinstance(features, str):
+            features = self.parse(features)
+        return self._conflicts(features)
+
+    def _conflicts(self, features):
+        features = list(dict.fromkeys(features))
+        indexes = [self._property_masks[f].bit_length() - 1 for f in features]
+        extents = self._property_extents
+        if self._common_extent(indexes):
+            return ()
+
+        pairs = self._pair_conflicts
+        if pairs is None:
+            pairs = self._pair_conflicts = [sum(1 << j for j, other in enumerate(extents)
+                                                if not extent & other)
+                                            for extent in extents]
+        for k, i in enumerate(indexes):
+            for h, j in enumerate(indexes[:k]):
+                if pairs[i] >> j & 1:
+                    return features[h], features[k]
+
+        kept = list(range(len(indexes)))  # drop features not needed for the conflict
+        for k in list(kept):
+            rest = [h for h in kept if h != k]
+            if not self._common_extent([indexes[h] for h in rest]):
+                kept = rest
+        return tuple(features[k] for k in kept)
+
+    def _common_extent(self, indexes):
+        extent = (1 << len(self._rows)) - 1
+        for i in indexes:
+            extent &= self._property_extents[i]
+        return extent
+
+    def validate_many(self, strings):
+        """Yield the :meth:`conflicts` of parsed feature ``strings``.
+
+        Repeated strings are parsed and checked once (as many as the lookup cache
+        holds, cf. :meth:`set_cache_size`).
+        """
+        seen = tools.LRUCache(self._cache.maxsize)
+        stats = self._stats
+        for string in strings:
+            result = seen.get(string)
+            if result is None:
+                result = self._conflicts(self._parse(string))
+                seen[string] = result
+            if result and stats is not None:
+                stats.reject()
+            yield result
+
+    def many(self, strings, allow_invalid=False):
+        """Yield featuresets from parsed feature ``strings`` (memoized by :meth:`__call__`)."""
+        for string in strings:
+            yield self(string, allow_invalid=allow_invalid)
+
+    @property
+    def stats(self):
+        """The :class:`.instrument.Stats` of the system (``None`` if not instrumented)."""
+        return self._stats
+
+    def instrument(self, callback=None, samples=1024):
+        """Start recording call counts and timings, return the :class:`.instrument.Stats`.
+
+        Records ``'parse'`` (uncached ``__call__`` strings), ``'closure'``
+        (feature combinations not spelled as a minimal or maximal intent),
+        ``'upset'``, ``'downset'``, ``'upset_union'``, ``'downset_union'``, and
+        rejected invalid featuresets. Uninstrumented systems run unwrapped code.
+        """
+        if self._stats is not None:
+            if callback is not None:
+                self._stats.callback = callback
+            return self._stats
+        from . import instrument
+
+        stats = instrument.Stats(self, callback=callback, samples=samples)
+        self._parse = stats.timed('parse', self.parse)
+        self._closure = stats.timed('closure', self._close)
+        self.upset_union = stats.timed('upset_union', self.upset_union)
+        self.downset_union = stats.timed('downset_union', self.downset_union)
+        cls = self.FeatureSet
+        cls.upset = stats.timed('upset', cls.upset)
+        cls.downset = stats.timed('downset', cls.downset)
+        self._stats = stats
+        return stats
+
+    def uninstrument(self):
+        """Stop recording, return the final :class:`.instrument.Stats` (or ``None``)."""
+        stats, self._stats = self._stats, None
+        if stats is not None:
+            self._parse, self._closure = self.parse, self._close
+            del self.upset_union, self.downset_union
+            del self.FeatureSet.upset, self.FeatureSet.downset
+        return stats
+
+    def cache_info(self):
+        """Return hit/miss/eviction statistics of the string lookup cache."""
+        return self._cache.info()
+
+    def cache_clear(self):
+        """Empty the string lookup cache and reset its statistics."""
+        self._cache.clear()
+
+    def set_cache_size(self, maxsize):
+        """Resize the string lookup cache (``0``: disabled, ``None``: unbounded)."""
+        self._cache.resize(maxsize)
+
     def __getitem__(self, index):
         """Return the feature set with the given ``index``."""
         return self._featuresets[index]
@@ -173,42 +466,281 @@ class FeatureSystem(metaclass=meta.FeatureSystemMeta):
 
     def __reduce__(self):
         if self.key is None:
-            return self.__class__, (self._config,)
+            return self._reduce_unnamed()
         return self.__class__, (self.key,)
 
+    def _reduce_unnamed(self, *index):
+        """Return the reduce tuple restoring by fingerprint, with ``index``."""
+        config = self._config
+        if self._fingerprint is None:
+            self._fingerprint = config.fingerprint()
+        definition = (config.context, config.format, config.str_maximal)
+        return self.__class__._restore, (self._fingerprint, definition, *index)
+
     @property
     def atoms(self):
         """The systems Minimal non-infimum feature sets."""
         return self.infimum.upper_neighbors
 
+    def build_tables(self, max_bytes=None):
+        """Precompute the pairwise join/meet index tables (return success).
+
+        Falls back to lattice operations if the tables would exceed ``max_bytes``
+        (default: :attr:`lookup_tables_max_bytes`).
+        """
+        if max_bytes is None:
+            max_bytes = self.lookup_tables_max_bytes
+
+        n = len(self._featuresets)
+        typecode = next(t for t in 'BHIL' if n <= 1 << 8 * array.array(t).itemsize)
+        row = bytes(n * array.array(typecode).itemsize)
+        if 2 * n * len(row) > max_bytes:
+            self._joins = self._meets = ()
+            return False
+
+        concepts = [f.concept for f in self._featuresets]
+        joins = [array.array(typecode, row) for _ in range(n)]
+        meets = [array.array(typecode, row) for _ in range(n)]
+        for i, c in enumerate(concepts):
+            for j in range(i, n):
+                joins[i][j] = joins[j][i] = c.join(concepts[j]).index
+                meets[i][j] = meets[j][i] = c.meet(concepts[j]).index
+
+        self._joins, self._meets = joins, meets
+        return True
+
+    def _lookup_tables(self):
+        if self._joins is None:
+            self.build_tables()
+        return self._joins, self._meets
+
     def join(self, featuresets):
         """Return the nearest featureset that subsumes all given ones."""
+        joins = self._joins
+        if joins is None:
+            joins = self._lookup_tables()[0]
+        if joins:
+            indexes = (f.index for f in featuresets)
+            index = functools.reduce(lambda i, j: joins[i][j], indexes,
+                                     self.infimum.index)
+            return self._featuresets[index]
+
         concepts = (f.concept for f in featuresets)
         join = self.lattice.join(concepts)
         return self._featuresets[join.index]
 
     def meet(self, featuresets):
         """Return the nearest featureset that implies all given ones."""
+        meets = self._meets
+        if meets is None:
+            meets = self._lookup_tables()[1]
+        if meets:
+            indexes = (f.index for f in featuresets)
+            index = functools.reduce(lambda i, j: meets[i][j], indexes,
+                                     self.supremum.index)
+            return self._featuresets[index]
+
         concepts = (f.concept for f in featuresets)
         meet = self.lattice.meet(concepts)
         return self._featuresets[meet.index]
 
+    def to_indexes(self, featuresets):
+        """Return the NumPy integer array of the indexes of ``featuresets``."""
+        from . import matrices
+
+        return matrices.to_indexes(featuresets)
+
+    def from_indexes(self, indexes):
+        """Return the list of featuresets with the given ``indexes``."""
+        from . import matrices
+
+        return matrices.from_indexes(self, indexes)
+
+    def join_pairs(self, left, right):
+        """Return the index array of the joins of the ``left`` and ``right`` index arrays."""
+        from . import matrices
+
+        return matrices.join_pairs(self, left, right)
+
+    def meet_pairs(self, left, right):
+        """Return the index array of the meets of the ``left`` and ``right`` index arrays."""
+        from . import matrices
+
+        return matrices.meet_pairs(self, left, right)
+
+    def join_groups(self, indexes, indptr):
+        """Return the index array of the join of each CSR-style group of ``indexes``.
+
+        Group ``i`` consists of ``indexes[indptr[i]:indptr[i + 1]]``.
+        """
+        from . import matrices
+
+        return matrices.join_groups(self, indexes, indptr)
+
+    def meet_groups(self, indexes, indptr):
+        """Return the index array of the meet of each CSR-style group of ``indexes``.
+
+        Group ``i`` consists of ``indexes[indptr[i]:indptr[i + 1]]``.
+        """
+        from . import matrices
+
+        return matrices.meet_groups(self, indexes, indptr)
+
+    def _order_sets(self):
+        upsets, downsets, dorder = lattices.order_sets(self.lattice)
+        self._dorder = dorder  # set before the masks checked by the callers
+        self._downsets = downsets
+        self._upsets = upsets
+
+    def upset_indexes(self, featuresets):
+        """Return the ascending indexes of all featuresets that subsume any of the given ones."""
+        if self._upsets is None:
+            self._order_sets()
+        upsets = self._upsets
+        mask = 0
+        for f in featuresets:
+            mask |= upsets[f.index]
+        return lattices.members(mask)
+
+    def downset_indexes(self, featuresets):
+        """Return the indexes of all featuresets that imply any of the given ones.
+
+        Ordered from the most general to the most specific (``dindex``).
+        """
+        if self._downsets is None:
+            self._order_sets()
+        downsets = self._downsets
+        mask = 0
+        for f in featuresets:
+            mask |= downsets[f.index]
+        return tuple(map(self._dorder.__getitem__, lattices.members(mask)))
+
     def upset_union(self, featuresets):
         """Yield all featuresets that subsume any of the given ones."""
-        concepts = (f.concept for f in featuresets)
-        indexes = (c.index for c in self.lattice.upset_union(concepts))
-        return map(self._featuresets.__getitem__, indexes)
+        return map(self._featuresets.__getitem__, self.upset_indexes(featuresets))
 
     def downset_union(self, featuresets):
         """Yield all featuresets that imply any of the given ones."""
-        concepts = (f.concept for f in featuresets)
-        indexes = (c.index for c in self.lattice.downset_union(concepts))
-        return map(self._featuresets.__getitem__, indexes)
+        return map(self._featuresets.__getitem__, self.downset_indexes(featuresets))
+
+    def _select_sets(self):
+        objects = [0] * len(self._rows)
+        sizes = {}
+        for f in self._featuresets:
+            bit = 1 << f.index
+            for o in lattices.members(f._extent):
+                objects[o] |= bit
+            size = f._extent.bit_count()
+            sizes[size] = sizes.get(size, 0) | bit
+        self._size_sets = sizes  # set before the masks checked by the callers
+        self._object_sets = objects
+
+    def select_indexes(self, subsumes=None, implies=None,
+                       compatible_with=None, incompatible_with=None, extent_size=None):
+        """Return the ascending indexes of the featuresets matching all given conditions.
+
+        Args:
+            subsumes: Select the featuresets that subsume this one.
+            implies: Select the featuresets that imply this one.
+            compatible_with: Select the featuresets compatible with this one.
+            incompatible_with: Select the featuresets incompatible with this one.
+            extent_size: Number of extent objects (``int`` or container such as ``range``).
+
+        Featuresets can also be given as anything accepted by :meth:`__call__`.
+        """
+        if self._object_sets is None:
+            self._select_sets()
+        objects = self._object_sets
+        mask = (1 << len(self._featuresets)) - 1
+
+        if subsumes is not None:
+            for o in lattices.members(self(subsumes, allow_invalid=True)._extent):
+                mask &= objects[o]
+        if implies is not None:
+            outside = self.supremum._extent & ~self(implies, allow_invalid=True)._extent
+            for o in lattices.members(outside):
+                mask &= ~objects[o]
+        for other, compatible in ((compatible_with, True), (incompatible_with, False)):
+            if other is not None:
+                overlapping = 0
+                for o in lattices.members(self(other, allow_invalid=True)._extent):
+                    overlapping |= objects[o]
+                mask &= overlapping if compatible else ~overlapping
+        if extent_size is not None:
+            sizes = self._size_sets
+            if isinstance(extent_size, int):
+                mask &= sizes.get(extent_size, 0)
+            else:
+                mask &= sum(m for size, m in sizes.items() if size in extent_size)
+        return lattices.members(mask)
+
+    def select(self, **conditions):
+        """Yield the featuresets matching all given conditions (see :meth:`select_indexes`)."""
+        return map(self._featuresets.__getitem__, self.select_indexes(**conditions))
+
+    def relation_matrix(self, kind, subset=None, sparse=False):
+        """Return the boolean NumPy matrix of ``kind`` between (``subset``) featuresets.
+
+        ``kind`` is the name of a :class:`.FeatureSet` comparison method
+        (e.g. ``'subsumes'``), cell ``[i, j]`` is the result of comparing
+        featureset ``i`` with ``j``. ``subset`` is a sequence of featuresets
+        or indexes, ``sparse=True`` returns a ``scipy.sparse.csr_matrix``
+        computed without the dense intermediate matrices.
+        """
+        from . import matrices
+
+        return matrices.relation_matrix(self, kind, subset=subset, sparse=sparse)
+
+    def share(self, name=None, path=None):
+        """Export the built tables to shared memory ``name`` or the file ``path``.
+
+        Return the :class:`.shared.Tables` (owned by the caller, who must
+        ``unlink()`` it), other processes pass its ``name`` to :meth:`attach`.
+        """
+        from . import shared
+
+        return shared.export(self, name=name, path=path)
+
+    @classmethod
+    def attach(cls, name=None, path=None):
+        """Return a read-only :class:`.shared.SharedSystem` on tables from :meth:`share`.
+
+        The view answers queries from the shared buffer without building the
+        lattice (close it when done).
+        """
+        from . import shared
+
+        tables = shared.attach(name=name, path=path)
+        try:
+            info = tables.meta
+            if info['key'] is not None:
+                config = meta.Config(info['key'])
+            else:
+                config = meta.Config.create(context=info['context'],
+                                            format=info['format'],
+                                            str_maximal=info['str_maximal'])
+            if config.fingerprint() != info['fingerprint']:
+                raise ValueError(f'shared tables {tables.name!r} do not match'
+                                 f' the definition of {config.key!r}')
+            return shared.SharedSystem(tables)
+        except BaseException:
+            tables.close()
+            raise
 
     def graphviz(self, highlight=None, maximal_label=None, topdown=None,
                  filename=None, directory=None, render=False, view=False,
                  **kwargs):
         """Return the system lattice visualization as graphviz source."""
+        from . import visualize
+
         return visualize.featuresystem(self, highlight, maximal_label,
                                        topdown, filename, directory,
                                        render, view, **kwargs)
+
+    def write_dot(self, file, highlight=None, maximal_label=None, topdown=None,
+                  **kwargs):
+        """Write the system lattice visualization as graphviz source to ``file``."""
+        from . import visualize
+
+        return visualize.write_dot(self, file, highlight, maximal_label,
+                                   topdown, **kwargs)
@@ -1,6 +1,11 @@
 """Generic re-useable helpers."""
 
-__all__ = ['uniqued', 'butlast', 'generic_translate']
+import collections
+
+__all__ = ['uniqued', 'butlast', 'generic_translate', 'LRUCache']
+
+CacheInfo = collections.namedtuple('CacheInfo', ['hits', 'misses', 'evictions',
+                                                 'maxsize', 'currsize'])
 
 
 def uniqued(iterable):
@@ -50,3 +55,76 @@ def generic_translate(frm=None, to=None, delete=''):
         return basestr.translate(string_trans)
 
     return translate
+
+
+class LRUCache(object):
+    """Bounded mapping discarding the least recently used items.
+
+    >>> cache = LRUCache(maxsize=2)
+
+    >>> cache['spam'] = 1
+    >>> cache['eggs'] = 2
+
+    >>> cache.get('spam')
+    1
+
+    >>> cache['ham'] = 3
+
+    >>> cache.get('eggs') is None
+    True
+
+    >>> cache.info()
+    CacheInfo(hits=1, misses=1, evictions=1, maxsize=2, currsize=2)
+
+    >>> cache.resize(0)
+    >>> cache['spam'] = 1
+    >>> cache.get('spam') is None
+    True
+    """
+
+    def __init__(self, maxsize=128):
+        self._data = collections.OrderedDict()
+        self.maxsize = maxsize  #: Maximal number of items (``0``: disabled, ``None``: unbounded).
+        self.hits = self.misses = self.evictions = 0
+
+    def get(self, key, default=None):
+        """Return the cached value for ``key`` (marked as recently used)."""
+        try:
+            value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def __setitem__(self, key, value):
+        if self.maxsize == 0:
+            return
+        self._data[key] = value
+        self._data.move_to_end(key)
+        self._evict()
+
+    def __len__(self):
+        return len(self._data)
+
+    def _evict(self):
+        if self.maxsize is not None:
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def resize(self, maxsize):
+        """Set ``maxsize`` and discard items exceeding it."""
+        self.maxsize = maxsize
+        self._evict()
+
+    def clear(self):
+        """Discard all items and reset the statistics."""
+        self._data.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    def info(self):
+        """Return the hit/miss/eviction statistics."""
+        return CacheInfo(self.hits, self.misses, self.evictions,
+                         self.maxsize, len(self._data))
@@ -1,8 +1,13 @@
 """Generate graphviz DOT source of feature lattice."""
 
+import collections
+import concurrent.futures
+import functools
+import time
+
 import graphviz
 
-__all__ = ['featuresystem', 'render_all']
+__all__ = ['featuresystem', 'write_dot', 'render_all']
 
 DIRECTORY = 'graphs'
 
@@ -26,6 +31,69 @@ def featuresystem(fs, highlight, maximal_label, topdown,
     if topdown is None:
         topdown = TOPDOWN
 
+    dot = _digraph(fs, maximal_label, topdown, filename, directory, **kwargs)
+
+    node_format = _node_format(highlight)
+
+    node_name = NAME_GETTERS[0]
+
+    node_label = LABEL_GETTERS[bool(maximal_label)]
+
+    node_neighbors = NEIGHBORS_GETTERS[bool(topdown)]
+
+    sortkey = lambda f: f.index  # noqa: E731
+
+    for f in fs._featuresets:
+        name = node_name(f)
+        dot.node(name, node_label(f), _attributes=node_format(f.index))
+        dot.edges((name, node_name(n))
+                  for n in sorted(node_neighbors(f), key=sortkey))
+
+    if render or view:
+        dot.render(view=view)  # pragma: no cover
+    return dot
+
+
+def write_dot(fs, file, highlight=None, maximal_label=None, topdown=None,
+              **kwargs):
+    """Write the DOT source of :func:`featuresystem` line by line to ``file``.
+
+    ``file`` is a path or a file-like object with a ``write()`` method.
+    """
+    if maximal_label is None:
+        maximal_label = MAXIMAL_LABEL
+
+    if topdown is None:
+        topdown = TOPDOWN
+
+    if not hasattr(file, 'write'):
+        with open(file, 'w', encoding='utf-8') as f:
+            return write_dot(fs, f, highlight, maximal_label, topdown, **kwargs)
+
+    dot = _digraph(fs, maximal_label, topdown, None, None, **kwargs)
+
+    node_format = _node_format(highlight)
+
+    node_label = LABEL_GETTERS[bool(maximal_label)]
+
+    if topdown:
+        neighbors = [[n.index for n in f.concept.upper_neighbors] for f in fs._featuresets]
+    else:
+        neighbors = [sorted(n.index for n in f.concept.lower_neighbors)
+                     for f in fs._featuresets]
+
+    attr_list = dot._attr_list
+    write = file.write
+    *head, tail = dot
+    write(''.join(head))
+    for f, indexes in zip(fs._featuresets, neighbors):
+        index = f.index
+        write(f'\tf{index:d}{attr_list(node_label(f), attributes=node_format(index))}\n')
+        write(''.join([f'\tf{index:d} -> f{n:d}\n' for n in indexes]))
+    write(tail)
+
+
+def _digraph(fs, maximal_label, topdown, filename, directory, **kwargs):
     name = fs.key if fs.key is not None else f'{id(fs):#x}'
 
     if filename is None:
@@ -40,46 +108,75 @@ def featuresystem(fs, highlight, maximal_label, topdown,
                            edge_attr={'arrowtail': 'none', 'penwidth': '.5'},
                            **kwargs)
 
-    if highlight is not None:
-        def node_format(f, dw=set(highlight.downset), up=set(highlight.upset)):
-            if f in dw:
-                return (('style', 'filled'), ('color', 'gray60'))
-            elif f in up:
-                return (('style', 'filled'), ('color', 'gray80'))
-            elif f is highlight:
-                return (('style', 'filled'), ('color', 'gray20'))
-    else:
-        node_format = lambda f: None  # noqa: E731
+    if not topdown:
+        dot.edge_attr.update(dir='back')
+    return dot
 
-    node_name = NAME_GETTERS[0]
 
-    node_label = LABEL_GETTERS[bool(maximal_label)]
+def _node_format(highlight):
+    if highlight is None:
+        return lambda index: None
 
-    node_neighbors = NEIGHBORS_GETTERS[bool(topdown)]
+    dw = {f.index for f in highlight.downset()}
+    up = {f.index for f in highlight.upset()}
 
-    if not topdown:
-        dot.edge_attr.update(dir='back')
+    def node_format(index):
+        if index == highlight.index:
+            return (('style', 'filled'), ('color', 'gray20'))
+        elif index in dw:
+            return (('style', 'filled'), ('color', 'gray60'))
+        elif index in up:
+            return (('style', 'filled'), ('color', 'gray80'))
 
-    sortkey = lambda f: f.index  # noqa: E731
+    return node_format
 
-    for f in fs._featuresets:
-        name = node_name(f)
-        dot.node(name, node_label(f), _attributes=node_format(f))
-        dot.edges((name, node_name(n))
-                  for n in sorted(node_neighbors(f), key=sortkey))
 
-    if render or view:
-        dot.render(view=view)  # pragma: no cover
-    return dot
+RenderResult = collections.namedtuple('RenderResult', ['key', 'seconds', 'error'])
 
 
 def render_all(maximal_label=MAXIMAL_LABEL, topdown=TOPDOWN,
-               directory=DIRECTORY, format=None):  # pragma: no cover
-    from features.systems import FeatureSystem
+               directory=DIRECTORY, format=None, workers=1):
+    """Render all feature systems of the config stack.
+
+    With ``workers`` other than ``1``, build and render in a process pool
+    (``None``: one process per CPU). Return a list of ``(key, seconds, error)``
+    results, errors are reported as strings without stopping the others.
+    """
     from features.meta import Config
 
-    for conf in Config:
-        fs = FeatureSystem(conf)
+    render = functools.partial(_render, maximal_label=maximal_label,
+                               topdown=topdown, directory=directory,
+                               format=format)
+
+    configs = list(Config)
+    if workers == 1:
+        return list(map(render, configs))
+
+    # send plain definitions: configs of added files belong to unpicklable classes
+    definitions = [(c.key, c.context, c.format, c.str_maximal) for c in configs]
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(render, definitions))
+
+
+def _render(config, maximal_label, topdown, directory, format):
+    """Render ``config`` (or its ``(key, context, format, str_maximal)`` definition)."""
+    from features.meta import Config
+    from features.systems import FeatureSystem
+
+    start = time.perf_counter()
+    definition = config if isinstance(config, tuple) else None
+    key = definition[0] if definition is not None else config.key
+    try:
+        if definition is not None:
+            key, context, frmat, str_maximal = definition
+            config = Config.create(key, context=context, format=frmat,
+                                   str_maximal=str_maximal)
+        fs = FeatureSystem(config)
         dot = fs.graphviz(maximal_label=maximal_label, topdown=topdown,
                           directory=directory, format=format)
         dot.render()
+    except Exception as e:
+        error = f'{e.__class__.__name__}: {e}'
+    else:
+        error = None
+    return RenderResult(key, time.perf_counter() - start, error)
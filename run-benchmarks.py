@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+
+"""Time feature system operations on synthetic contexts, write JSON results."""
+
+import argparse
+import datetime
+import io
+import itertools
+import json
+import platform
+import sys
+import timeit
+
+import features
+from features import FeatureSystem, make_features
+
+SIZES = {'small': {'crossed': [2, 3, 4], 'privative': [10, 100], 'gender': [(2, 2, 2)]},
+         'medium': {'crossed': [5, 6], 'privative': [1000], 'gender': [(3, 3, 3)]},
+         'large': {'crossed': [7], 'privative': [3000], 'gender': [(4, 3, 4)]}}
+
+SAMPLE = 2_000
+
+
+def table(objects, properties, intents):
+    """Return a context in ``make_features()`` table format."""
+    width = max(map(len, objects))
+    lines = [' ' * width + '|' + '|'.join(properties) + '|']
+    for o, intent in zip(objects, intents):
+        cells = ('X'.center(len(p)) if p in intent else ' ' * len(p)
+                 for p in properties)
+        lines.append(o.ljust(width) + '|' + '|'.join(cells) + '|')
+    return '\n'.join(lines)
+
+
+def crossed(n):
+    """Return the context of ``n`` crossed binary features (``2 ** n`` objects)."""
+    names = [f'b{i:02d}x' for i in range(n)]
+    properties = [f'{s}{n}' for n in names for s in '+-']
+    signs = list(itertools.product('+-', repeat=n))
+    objects = ['o' + ''.join('1' if s == '+' else '0' for s in ss) for ss in signs]
+    intents = [{f'{s}{n}' for s, n in zip(ss, names)} for ss in signs]
+    return table(objects, properties, intents)
+
+
+def privative(n):
+    """Return the context of ``n`` objects with one privative feature each."""
+    properties = [f'p{i:04d}x' for i in range(n)]
+    objects = [f'o{i}' for i in range(n)]
+    return table(objects, properties, [{p} for p in properties])
+
+
+def gender(persons, numbers, genders):
+    """Return a person/number context with gender distinctions in the last person."""
+    person_names = [f'+r{i}x' for i in range(persons)]
+    number_names = [f'+n{i}x' for i in range(numbers)]
+    gender_names = [f'+g{i}x' for i in range(genders)]
+    properties = [f'{s}{n[1:]}' for n in person_names + number_names + gender_names
+                  for s in '+-']
+    objects, intents = [], []
+    for (p, person), (n, number) in itertools.product(enumerate(person_names),
+                                                      enumerate(number_names)):
+        base = ({person} | {f'-{q[1:]}' for q in person_names if q != person}
+                | {number} | {f'-{m[1:]}' for m in number_names if m != number})
+        if p < persons - 1:
+            objects.append(f'o{p}{n}')
+            intents.append(base)
+            continue
+        for g, gend in enumerate(gender_names):
+            objects.append(f'o{p}{n}{g}')
+            intents.append(base | {gend} | {f'-{h[1:]}' for h in gender_names if h != gend})
+    return table(objects, properties, intents)
+
+
+def sample(items, size=SAMPLE):
+    """Return up to ``size`` items spread evenly over ``items``."""
+    step = max(1, len(items) // size)
+    return items[::step][:size]
+
+
+def benchmarks(context):
+    """Yield ``(name, callable)`` pairs timing operations on ``context``."""
+    def construct():
+        FeatureSystem.clear_unnamed()
+        return make_features(context)
+
+    fs = construct()
+    strings = [f.string for f in fs]
+    pairs = sample(list(itertools.product(fs, repeat=2)))
+    left = [f for f, _ in pairs]
+    right = [g for _, g in pairs]
+
+    yield 'construct', construct
+
+    def parse():
+        fs.cache_clear()
+        for s in strings:
+            fs(s, allow_invalid=True)
+
+    yield 'parse', parse
+    yield 'parse_cached', lambda: [fs(s, allow_invalid=True) for s in strings]
+    yield 'subsumes', lambda: [f.subsumes(g) for f, g in pairs]
+    yield 'orthogonal_to', lambda: [f.orthogonal_to(g) for f, g in pairs]
+    yield 'join', lambda: [f % g for f, g in pairs]
+    yield 'meet', lambda: [f ^ g for f, g in pairs]
+    yield 'join_pairs', lambda: fs.join_pairs(fs.to_indexes(left), fs.to_indexes(right))
+    yield 'upper_neighbors', lambda: [f.upper_neighbors for f in fs]
+    yield 'upset', lambda: [f.upset() for f in sample(list(fs), 200)]
+    yield 'upset_union', lambda: [list(fs.upset_union([f, g])) for f, g in pairs[:200]]
+    yield 'graphviz', lambda: fs.graphviz().source
+    yield 'write_dot', lambda: fs.write_dot(io.StringIO())
+
+
+def run(sizes, repeat, number):
+    results = []
+    for kind, args in sizes.items():
+        for arg in args:
+            generate = globals()[kind]
+            context = generate(*arg) if isinstance(arg, tuple) else generate(arg)
+            fs = make_features(context)
+            name = f'{kind}{arg}'
+            print(f'{name}: {len(fs.context.objects)} objects,'
+                  f' {len(fs.context.properties)} properties, {len(fs)} featuresets')
+            for op, func in benchmarks(context):
+                try:
+                    times = timeit.repeat(func, repeat=repeat, number=number)
+                except ImportError as e:  # optional dependency
+                    print(f'    {op:<16} skipped ({e})')
+                    continue
+                best = min(times) / number
+                print(f'    {op:<16} {best * 1000:10.3f} ms')
+                results.append({'system': name,
+                                'objects': len(fs.context.objects),
+                                'properties': len(fs.context.properties),
+                                'featuresets': len(fs),
+                                'operation': op,
+                                'seconds': best,
+                                'times': [t / number for t in times]})
+    return results
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--size', choices=list(SIZES), default='small')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--number', type=int, default=1)
+    parser.add_argument('--output', default='bench-results.json',
+                        help='path of the JSON results file (default: %(default)s)')
+    args = parser.parse_args(args)
+
+    results = run(SIZES[args.size], repeat=args.repeat, number=args.number)
+    meta = {'features': features.__version__,
+            'python': sys.version,
+            'platform': platform.platform(),
+            'date': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            'size': args.size}
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump({'meta': meta, 'results': results}, f, indent=2)
+    print(f'written {args.output}')
+
+
+if __name__ == '__main__':
+    main()
@@ -2,6 +2,7 @@
 
 import pytest
 
+import features
 from features.meta import Config
 from features.systems import FeatureSystem
 
@@ -11,7 +12,34 @@ def fs(name='plural'):
     return FeatureSystem(name)
 
 
-@pytest.fixture(scope='session')
+@pytest.fixture
 def fs_noname(fs):
     config = Config.create(context=fs._config.context)
     return FeatureSystem(config)
+
+
+@pytest.fixture
+def clear_unnamed():
+    FeatureSystem.clear_unnamed()
+    yield
+    FeatureSystem.clear_unnamed()
+
+
+EXTRA_CONFIG = """
+[extra]
+description = added config file
+context =
+     |+a|-a|
+    x| X|  |
+    y|  | X|
+"""
+
+
+@pytest.fixture
+def extra_config(tmp_path):
+    path = tmp_path / 'extra.ini'
+    path.write_text(EXTRA_CONFIG, encoding='utf-8')
+    features.add_config(str(path))
+    yield Config.stack[str(path)]
+    Config.stack._classes.remove(Config.stack._map.pop(str(path)))
+    Config._names = None
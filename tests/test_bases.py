@@ -3,6 +3,23 @@ import pickle
 import pytest
 
 from features.bases import FeatureSet
+from features.meta import Config
+from features.systems import FeatureSystem
+
+
+def test_slots(fs):
+    assert not hasattr(fs('1'), '__dict__')
+    assert fs.FeatureSet.__slots__ == ()
+
+
+@pytest.mark.parametrize('name', ['atoms', 'upper_neighbors', 'lower_neighbors'])
+def test_neighbors_shared(fs, name):
+    for f in fs:
+        result = getattr(f, name)
+        assert isinstance(result, tuple)
+        assert getattr(f, name) is result
+        assert [g.index for g in result] \
+               == [c.index for c in getattr(f.concept, name)]
 
 
 def test_pickle_base(fs):
@@ -18,8 +35,6 @@ def test_pickle_class(fs):
 def test_pickle_class_noname(fs_noname):
     cls = pickle.loads(pickle.dumps(fs_noname.FeatureSet))
     assert issubclass(cls, FeatureSet)
-    pytest.xfail(reason='TODO')
-    assert isinstance(cls, FeatureSet)
     assert cls is fs_noname.FeatureSet
 
 
@@ -32,6 +47,29 @@ def test_pickle_instance_noname(fs_noname):
     assert fs_noname('1') is fs_noname('1')
     inst = pickle.loads(pickle.dumps(fs_noname('1')))
     assert isinstance(inst, FeatureSet)
+    assert inst is fs_noname('1')
+
+
+def test_pickle_instance_noname_registered(monkeypatch, fs_noname):
+    data = pickle.dumps(fs_noname('1'))
+    assert b'features.meta' not in data
+
+    def create(*args, **kwargs):
+        raise AssertionError('unexpected Config.create() call')
+
+    monkeypatch.setattr(Config, 'create', create)
+    assert pickle.loads(data) is fs_noname('1')
+
+
+@pytest.mark.usefixtures('clear_unnamed')
+def test_pickle_instance_noname_rebuild(fs_noname):
+    data = pickle.dumps([fs_noname('1'), fs_noname('+sg')])
+    FeatureSystem.clear_unnamed()
+    inst, other = pickle.loads(data)
+    assert inst.system is other.system
+    assert inst.system is not fs_noname
+    assert inst.system.context == fs_noname.context
+    assert (inst.string, other.string) == ('+1', '+sg')
 
 
 @pytest.mark.parametrize(
@@ -39,7 +77,7 @@ def test_pickle_instance_noname(fs_noname):
     [('1sg', ['+1', '-3 +sg', '-2 +sg'])])
 def test_upper_neighbors_nonsup(fs, features, expected):
     features = fs(features)
-    expected = [fs(e) for e in expected]
+    expected = tuple(fs(e) for e in expected)
     assert features._upper_neighbors_nonsup() == expected
 
 
@@ -80,3 +118,16 @@ def test_upset_union_nonsup(fs, features, other, expected):
     features, other = (fs(f) for f in (features, other))
     expected = [fs(e) for e in expected]
     assert list(features._upset_union_nonsup(other)) == expected
+
+
+@pytest.mark.parametrize('name', [c.key for c in Config])
+@pytest.mark.parametrize(
+    'method',
+    ['subsumes', 'implies', 'properly_subsumes', 'properly_implies',
+     'incompatible_with', 'complement_of', 'subcontrary_with', 'orthogonal_to'])
+def test_relations_bitmask(name, method):
+    fs = FeatureSystem(name)
+    for f in fs:
+        for g in fs:
+            expected = getattr(f.concept, method)(g.concept)
+            assert getattr(f, method)(g) == bool(expected)
@@ -0,0 +1,38 @@
+import subprocess
+import sys
+
+import pytest
+
+IMPORT_TIME_BUDGET = 0.25
+
+DEFERRED = ('concepts', 'graphviz', 'numpy', 'concurrent.futures',
+            'features.instrument', 'features.matrices', 'features.sections',
+            'features.shared', 'features.storage', 'features.visualize')
+
+
+def run_python(code):
+    return subprocess.run([sys.executable, '-c', code], check=True,
+                          capture_output=True, text=True).stdout
+
+
+@pytest.mark.parametrize('module', DEFERRED)
+def test_import_deferred(module):
+    code = f'import sys, features; print({module!r} in sys.modules)'
+    assert run_python(code).strip() == 'False'
+
+
+def test_import_config_deferred():
+    code = ('import features;'
+            ' print(features.Config._indexed);'
+            ' features.Config("plural");'
+            ' kwargs = features.Config.stack[-1]._kwargs;'
+            ' print(features.Config._indexed, type(kwargs).__name__,'
+            ' "plural" in kwargs, "dual" in kwargs)')
+    assert run_python(code).split() == ['False', 'True', 'Index', 'False', 'True']
+
+
+def test_import_time():
+    code = ('import time; start = time.perf_counter(); import features;'
+            ' print(time.perf_counter() - start)')
+    seconds = min(float(run_python(code)) for _ in range(3))
+    assert seconds < IMPORT_TIME_BUDGET
@@ -0,0 +1,127 @@
+import pytest
+
+from features import lattices, make_features
+from features.meta import Config
+from features.systems import FeatureSystem
+
+PLURAL = '''
+    |+1|-1|+2|-2|+3|-3|+sg|+pl|-sg|-pl|
+  1s| X|  |  | X|  | X|  X|   |   |  X|
+  1p| X|  |  | X|  | X|   |  X|  X|   |
+  2s|  | X| X|  |  | X|  X|   |   |  X|
+  2p|  | X| X|  |  | X|   |  X|  X|   |
+  3s|  | X|  | X| X|  |  X|   |   |  X|
+'''
+
+NUMBERLESS = '''
+    |+1|-1|+2|-2|+3|-3|+pl|-pl|
+  1s| X|  |  | X|  | X|   |  X|
+  1p| X|  |  | X|  | X|  X|   |
+  2s|  | X| X|  |  | X|   |  X|
+  2p|  | X| X|  |  | X|  X|   |
+  3s|  | X|  | X| X|  |   |  X|
+  3p|  | X|  | X| X|  |  X|   |
+'''
+
+
+def assert_equivalent(result, expected):
+    assert result.context == expected.context
+    assert len(result) == len(expected)
+    for f, g in zip(result, expected, strict=True):
+        assert (f.string, f.string_maximal, f.string_extent) \
+               == (g.string, g.string_maximal, g.string_extent)
+        assert [n.index for n in f.upper_neighbors] == [n.index for n in g.upper_neighbors]
+        assert [n.index for n in f.lower_neighbors] == [n.index for n in g.lower_neighbors]
+        assert [a.index for a in f.atoms] == [a.index for a in g.atoms]
+
+
+@pytest.mark.usefixtures('clear_unnamed')
+def test_extend_objects():
+    fs = make_features(PLURAL)
+    assert [f.string for f in fs]
+    result = fs.extend(objects=[('3p', ['-1', '-2', '+3', '+pl', '-sg'])])
+    expected = FeatureSystem('plural')
+    assert_equivalent(result, expected)
+    assert result is not expected
+    assert result.key is None
+
+
+@pytest.mark.usefixtures('clear_unnamed')
+def test_extend_properties():
+    fs = make_features(NUMBERLESS)
+    result = fs.extend(properties=[('+sg', ['1s', '2s', '3s']),
+                                   ('-sg', ['1p', '2p', '3p'])])
+    assert len(result) == len(FeatureSystem('plural'))
+    FeatureSystem.clear_unnamed()
+    assert_equivalent(result, FeatureSystem(Config.create(context=result._config.context)))
+
+
+@pytest.mark.usefixtures('clear_unnamed')
+def test_extend_objects_properties():
+    fs = make_features(NUMBERLESS)
+    result = fs.extend(objects=[('4s', ['-1', '-2', '-3', '-pl', '+4'])],
+                       properties=[('+4', ['4s']), ('-4', fs.context.objects)])
+    FeatureSystem.clear_unnamed()
+    assert_equivalent(result, FeatureSystem(Config.create(context=result._config.context)))
+
+
+@pytest.mark.usefixtures('clear_unnamed')
+def test_extend_objects_property_extents():
+    fs = make_features(NUMBERLESS)
+    result = fs.extend(objects=[('4s', ['-1', '-2', '-3', '-pl'])],
+                       properties=[('+4', ['4s']), ('-4', ['1s', '2s', '3s'])])
+    assert result.context.intension(['4s']) == ('-1', '-2', '-3', '-pl', '+4')
+    assert result.context.extension(['+4']) == ('4s',)
+    FeatureSystem.clear_unnamed()
+    assert_equivalent(result, FeatureSystem(Config.create(context=result._config.context)))
+
+
+@pytest.mark.parametrize(
+    'objects, properties, match',
+    [([('1x', ['+1', 'spam'])], [], r'unknown features'),
+     ([], [('spam', ['1s', 'eggs'])], r'unknown objects'),
+     ([('1x', ['+1', '-2', '-3', '-pl'])], [], r'individual')])
+def test_extend_invalid(objects, properties, match):
+    fs = make_features(NUMBERLESS)
+    with pytest.raises(ValueError, match=match):
+        fs.extend(objects=objects, properties=properties)
+
+
+def lattice_data(lattice):
+    return [(c._extent, c._intent, c.dindex,
+             [u.index for u in c.upper_neighbors],
+             [n.index for n in c.lower_neighbors]) for c in lattice]
+
+
+@pytest.mark.parametrize('name', [c.key for c in Config])
+def test_build(name):
+    import concepts
+
+    config = Config(name)
+    context = concepts.Context.fromstring(config.context, frmat=config.format)
+    assert lattice_data(lattices.build(context)) == lattice_data(context.lattice)
+
+
+def test_build_workers():
+    import concepts
+
+    context = concepts.Context.fromstring(NUMBERLESS)
+    assert lattice_data(lattices.build(context, workers=2)) == lattice_data(context.lattice)
+
+
+@pytest.mark.usefixtures('clear_unnamed')
+@pytest.mark.parametrize('builder', ['concepts', 'bitsets'])
+def test_lattice_builder(builder):
+    class System(FeatureSystem):
+        lattice_builder = builder
+
+    result = System(Config.create(context=PLURAL))
+    assert_equivalent(result, FeatureSystem(Config.create(context=PLURAL)))
+
+
+def test_lattice_builder_invalid():
+    class System(FeatureSystem):
+        lattice_builder = 'spam'
+
+    with pytest.raises(ValueError, match=r'unknown lattice_builder'):
+        System._make_context(Config.create(context=PLURAL))
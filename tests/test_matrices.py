@@ -0,0 +1,81 @@
+import pytest
+
+from features.matrices import RELATIONS
+from features.meta import Config
+from features.systems import FeatureSystem
+
+np = pytest.importorskip('numpy')
+
+
+@pytest.mark.parametrize('name', [c.key for c in Config])
+@pytest.mark.parametrize('kind', RELATIONS)
+def test_relation_matrix(name, kind):
+    fs = FeatureSystem(name)
+    expected = [[getattr(f, kind)(g) for g in fs] for f in fs]
+    assert fs.relation_matrix(kind).tolist() == expected
+
+
+def test_relation_matrix_subset(fs):
+    subset = [fs('1'), fs('sg'), 0]
+    result = fs.relation_matrix('orthogonal_to', subset)
+    assert result.tolist() == [[False, True, False],
+                               [True, False, False],
+                               [False, False, False]]
+
+
+def test_relation_matrix_index_array(fs):
+    subset = [fs('1'), fs('sg'), fs[0]]
+    result = fs.relation_matrix('orthogonal_to', fs.to_indexes(subset))
+    assert result.tolist() == fs.relation_matrix('orthogonal_to', subset).tolist()
+
+
+@pytest.mark.parametrize('name', [c.key for c in Config])
+@pytest.mark.parametrize('kind', RELATIONS)
+def test_relation_matrix_sparse(name, kind):
+    pytest.importorskip('scipy')
+    fs = FeatureSystem(name)
+    subset = list(fs) + [fs.infimum, fs.supremum]
+    result = fs.relation_matrix(kind, subset, sparse=True)
+    assert result.format == 'csr'
+    assert result.toarray().tolist() == fs.relation_matrix(kind, subset).tolist()
+
+
+def test_relation_matrix_invalid(fs):
+    with pytest.raises(ValueError, match=r'unknown'):
+        fs.relation_matrix('spam')
+
+
+@pytest.mark.parametrize('name', [c.key for c in Config])
+def test_join_meet_pairs(name):
+    fs = FeatureSystem(name)
+    left, right = np.divmod(np.arange(len(fs) ** 2), len(fs))
+    joins = fs.from_indexes(fs.join_pairs(left, right))
+    meets = fs.from_indexes(fs.meet_pairs(left, right))
+    assert joins == [fs[i] % fs[j] for i, j in zip(left, right)]
+    assert meets == [fs[i] ^ fs[j] for i, j in zip(left, right)]
+
+
+@pytest.mark.parametrize('name', [c.key for c in Config])
+def test_join_meet_groups(name):
+    fs = FeatureSystem(name)
+    groups = [[], list(fs.atoms), [fs.supremum], fs[1:4], fs[-4:-1], []]
+    indexes = fs.to_indexes(f for g in groups for f in g)
+    indptr = np.cumsum([0] + [len(g) for g in groups])
+    assert fs.from_indexes(fs.join_groups(indexes, indptr)) == [fs.join(g) for g in groups]
+    assert fs.from_indexes(fs.meet_groups(indexes, indptr)) == [fs.meet(g) for g in groups]
+
+
+def test_join_meet_pairs_large():
+    n = 70
+    properties = [f'f{i:03d}x' for i in range(n)]
+    rows = [f'o{i}|' + '|'.join('X' if j in (i, (i + 1) % n) else ' '
+                                for j in range(n)) + '|' for i in range(n)]
+    context = '\n'.join(['  |' + '|'.join(properties) + '|'] + rows)
+    fs = FeatureSystem(Config.create(context=context))
+    assert fs._mask_arrays is None
+    left, right = np.divmod(np.arange(len(fs) ** 2), len(fs))
+    assert fs.from_indexes(fs.join_pairs(left, right)) \
+           == [fs[i] % fs[j] for i, j in zip(left, right)]
+    assert fs.from_indexes(fs.meet_pairs(left, right)) \
+           == [fs[i] ^ fs[j] for i, j in zip(left, right)]
+    assert fs._mask_arrays.extents.dtype == object
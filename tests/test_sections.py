@@ -0,0 +1,120 @@
+import codecs
+import configparser
+
+import pytest
+
+from features import sections
+from features.meta import Config
+
+INI = '''\
+[DEFAULT]
+format = table
+
+[spam]
+aliases = ham, eggs
+description = Spam
+context =
+      |+a|-a|
+     x| X|  |
+     y|  | X|
+
+[bacon]
+inherits = spam
+aliases =
+    lovely
+    sausage
+str_maximal = true
+'''
+
+
+@pytest.fixture(params=[False, True], ids=['plain', 'bom'])
+def ini(request, tmp_path):
+    path = tmp_path / 'spam.ini'
+    data = INI.encode('utf-8')
+    if request.param:
+        data = codecs.BOM_UTF8 + data
+    path.write_bytes(data)
+    return path
+
+
+def expected_kwargs(path):
+    parser = configparser.ConfigParser()
+    with open(path, encoding='utf-8-sig') as f:
+        parser.read_file(f)
+    result = {}
+    for key in parser.sections():
+        kwargs = dict(parser.items(key), key=key)
+        aliases = kwargs.pop('aliases', '')
+        if aliases.strip():
+            kwargs['aliases'] = aliases.replace(',', ' ').split()
+        if 'inherits' in kwargs:
+            kwargs = dict(((k, v) for k, v in parser.items(kwargs['inherits'])
+                           if k != 'aliases'), **kwargs)
+        result[key] = kwargs
+    return result
+
+
+def test_index(ini):
+    index = sections.load(str(ini), 'utf-8-sig')
+    assert index.keys == ['spam', 'bacon']
+    assert index.aliases == (dict.fromkeys(['ham', 'eggs'], 'spam')
+                             | dict.fromkeys(['lovely', 'sausage'], 'bacon'))
+    expected = expected_kwargs(ini)
+    assert index.pop('bacon') == expected['bacon']
+    assert 'bacon' not in index and len(index) == 1
+    assert index.pop('spam') == expected['spam']
+    with pytest.raises(KeyError):
+        index.pop('spam')
+
+
+def test_index_bundled():
+    config = Config.stack[-1]
+    index = sections.load(config.filename, config._encoding)
+    expected = expected_kwargs(config.filename)
+    assert index.keys == list(expected)
+    assert {key: index.pop(key) for key in index.keys} == expected
+
+
+def test_index_duplicate():
+    with pytest.raises(configparser.DuplicateSectionError, match=r'spam'):
+        sections.scan(b'[spam]\n[eggs]\n[spam]\n')
+
+
+def test_save_index(monkeypatch, ini):
+    index = sections.load(str(ini), save=True)
+    assert (ini.parent / 'spam.ini.idx').exists()
+
+    def scan(*args, **kwargs):
+        raise AssertionError('unexpected rescan')
+
+    with monkeypatch.context() as m:
+        m.setattr(sections, 'scan', scan)
+        assert sections.load(str(ini), save=True).keys == index.keys
+
+    ini.write_text(INI.replace('[bacon]', '[lovely bacon]'), encoding='utf-8')
+    assert sections.load(str(ini), save=True).keys == ['spam', 'lovely bacon']
+
+
+def test_config(ini):
+    class SpamConfig(Config):
+        filename = str(ini)
+
+    assert SpamConfig._names is None
+    bacon = SpamConfig('sausage')
+    assert SpamConfig('bacon') is bacon
+    assert (bacon.key, bacon.aliases, bacon.str_maximal) == ('bacon', ['lovely', 'sausage'], True)
+    assert bacon.context == SpamConfig('ham').context
+    assert [c.key for c in SpamConfig] == ['spam', 'bacon']
+    with pytest.raises(KeyError):
+        SpamConfig('nonsense')
+
+
+def test_config_add_missing(tmp_path):
+    class SpamConfig(Config):
+        filename = Config.filename
+
+    stack = list(SpamConfig.stack)
+    with pytest.raises(FileNotFoundError):
+        SpamConfig.add(str(tmp_path / 'missing.ini'))
+    assert list(SpamConfig.stack) == stack
+    assert SpamConfig('plural').key == 'plural'
@@ -0,0 +1,135 @@
+import concurrent.futures
+import itertools
+
+import pytest
+
+from features import shared
+from features.meta import Config
+from features.systems import FeatureSystem
+
+
+def assert_equivalent(result, expected):
+    assert len(result) == len(expected)
+    for f, g in zip(result, expected, strict=True):
+        assert f.index == g.index
+        assert (f._extent, f._intent) == (g._extent, g._intent)
+        assert (f.string, f.string_maximal, f.string_extent, str(f), repr(f), bool(f)) \
+               == (g.string, g.string_maximal, g.string_extent, str(g), repr(g), bool(g))
+        for attr in ('atoms', 'upper_neighbors', 'lower_neighbors'):
+            assert [n.index for n in getattr(f, attr)] == [n.index for n in getattr(g, attr)]
+        assert [n.index for n in f.upset()] == [n.index for n in g.upset()]
+        assert [n.index for n in f.downset()] == [n.index for n in g.downset()]
+        assert result(g.string, allow_invalid=True) == f \
+               == result(g.string_maximal.split(), allow_invalid=True)
+        assert result(f) is f
+
+
+def assert_operations(result, expected):
+    for f, g in itertools.product(result, repeat=2):
+        f_, g_ = expected[f.index], expected[g.index]
+        for name in ('subsumes', 'implies', 'properly_subsumes', 'properly_implies',
+                     'incompatible_with', 'complement_of', 'subcontrary_with',
+                     'orthogonal_to'):
+            assert getattr(f, name)(g) == getattr(f_, name)(g_)
+        assert (f % g).index == (f_ % g_).index
+        assert (f ^ g).index == (f_ ^ g_).index
+
+
+def _attached_strings(name):
+    with FeatureSystem.attach(name=name) as view:
+        return [f.string for f in view], view('1sg').string
+
+
+@pytest.fixture
+def tables(fs):
+    tables = fs.share()
+    yield tables
+    tables.close()
+    tables.unlink()
+
+
+def test_tables(fs, tables):
+    assert len(tables) == len(fs)
+    assert tables.meta['key'] == fs.key
+    for f in fs:
+        i = f.index
+        assert (tables.extent(i), tables.intent(i)) == (f._extent, f._intent)
+        assert tables.upper_neighbors(i) == tuple(n.index for n in f.upper_neighbors)
+        assert tables.lower_neighbors(i) == tuple(n.index for n in f.lower_neighbors)
+        assert tables.string(i) == f.string
+
+
+def test_attach_named(fs, tables):
+    with FeatureSystem.attach(name=tables.name) as view:
+        assert isinstance(view, shared.SharedSystem)
+        assert repr(view) == repr(fs).replace('FeatureSystem', 'SharedSystem')
+        assert (view.key, len(view)) == (fs.key, len(fs))
+        assert_equivalent(view, fs)
+        assert_operations(view, fs)
+        assert view.join([view('1sg'), view('2sg')]) == view('-3 +sg')
+        assert view.meet([view('-1'), view('-2')]) == view('+3')
+        assert [f.index for f in view.atoms] == [f.index for f in fs.atoms]
+        assert view.infimum.index == 0 and view.supremum.index == len(fs) - 1
+        assert view('1sg') in view and fs('1sg') not in view
+        assert view[-1] == view.supremum and not view.supremum
+        with pytest.raises(IndexError):
+            view[len(fs)]
+        with pytest.raises(ValueError, match=r'not a valid feature set in <SharedSystem'):
+            view('+1 -1')
+        assert view('+1 -1', allow_invalid=True) == view.infimum
+
+
+@pytest.mark.usefixtures('clear_unnamed')
+def test_attach_unnamed(fs_noname):
+    with fs_noname.share() as tables:
+        FeatureSystem.clear_unnamed()
+        with FeatureSystem.attach(name=tables.name) as view:
+            assert view.key is None
+            assert repr(view).startswith('<SharedSystem object of 6 atoms 22 featuresets')
+            assert_equivalent(view, fs_noname)
+        tables.unlink()
+
+
+@pytest.mark.usefixtures('clear_unnamed')
+def test_attach_path(tmp_path, fs_noname):
+    path = tmp_path / 'plural.tables'
+    fs_noname.share(path=path).close()
+    with FeatureSystem.attach(path=path) as view:
+        assert_equivalent(view, fs_noname)
+
+
+def test_attach_process(fs, tables):
+    with concurrent.futures.ProcessPoolExecutor(1) as executor:
+        result = executor.submit(_attached_strings, tables.name).result()
+    assert result == ([f.string for f in fs], '+1 +sg')
+
+
+def test_tables_context(fs, tables):
+    context = tables.context()
+    assert context == fs.context
+    assert [c.index for c in context.lattice] == [f.index for f in fs]
+
+
+@pytest.mark.usefixtures('clear_unnamed')
+def test_attach_mismatch(tmp_path):
+    fs = FeatureSystem(Config.create(context='''
+         |+a|-a|
+        x| X|  |
+        y|  | X|
+    '''))
+    data = shared.serialize(fs).replace(fs._config.fingerprint().encode(), b'0' * 64)
+    path = tmp_path / 'spam.tables'
+    path.write_bytes(data)
+    with pytest.raises(ValueError, match=r'do not match'):
+        FeatureSystem.attach(path=path)
+
+
+def test_tables_invalid():
+    with pytest.raises(ValueError, match=r'not a feature system tables'):
+        shared.Tables(b'spam' * 8)
+
+
+@pytest.mark.parametrize('kwargs', [{}, {'name': 'spam', 'path': 'eggs'}])
+def test_attach_arguments(kwargs):
+    with pytest.raises(TypeError, match=r'either name or path'):
+        shared.attach(**kwargs)
@@ -1,4 +1,9 @@
+import concurrent.futures
+import gc
+import itertools
 import pickle
+import time
+import weakref
 
 import pytest
 
@@ -37,6 +42,7 @@ def test_pickle_instance(fs):
 def test_pickle_instance_noname(fs_noname):
     inst = pickle.loads(pickle.dumps(fs_noname))
     assert isinstance(inst, FeatureSystem)
+    assert inst is fs_noname
 
 
 @pytest.mark.parametrize(
@@ -50,3 +56,357 @@ def test_downset_union(fs, features, expected):
     features = [fs(f) for f in features]
     expected = [fs(e, allow_invalid=True) for e in expected]
     assert list(fs.downset_union(features)) == expected
+
+
+@pytest.mark.parametrize('name', [c.key for c in Config])
+def test_build_tables(name):
+    fs = FeatureSystem(name)
+    config = Config.create(context=fs._config.context)
+    tables = FeatureSystem(config)
+    assert tables.build_tables()
+    for f, g in zip(fs, tables, strict=True):
+        for h, i in zip(fs, tables, strict=True):
+            assert (f % h).index == (g % i).index
+            assert (f ^ h).index == (g ^ i).index
+    assert tables.join(tables.atoms).index == fs.join(fs.atoms).index
+    assert tables.meet(tables.atoms[:2]).index == fs.meet(fs.atoms[:2]).index
+    assert tables.join([]) is tables.infimum
+    assert tables.meet([]) is tables.supremum
+
+
+def test_build_tables_max_bytes(fs_noname):
+    assert not fs_noname.build_tables(max_bytes=0)
+    assert fs_noname._joins == fs_noname._meets == ()
+    assert fs_noname('1sg') % fs_noname('2sg') == fs_noname('-3 +sg')
+    assert fs_noname.join([fs_noname('1sg'), fs_noname('3sg')]) == fs_noname('-2 +sg')
+
+
+@pytest.mark.usefixtures('clear_unnamed')
+def test_lookup_tables_lazy(monkeypatch, fs):
+    monkeypatch.setattr(FeatureSystem, 'lookup_tables', 'lazy')
+    lazy = FeatureSystem(Config.create(context=fs._config.context))
+    assert lazy._joins is None
+    assert lazy('1sg') ^ lazy('+1') == lazy('1sg')
+    assert lazy._joins
+
+
+@pytest.mark.usefixtures('clear_unnamed')
+def test_cache(fs):
+    fs = FeatureSystem(Config.create(context=fs._config.context))
+    assert fs('1sg') is fs('1sg')
+    with pytest.raises(ValueError, match=r"'\+1 -1' \(\['\+1', '-1'\]\)"):
+        fs('+1 -1')
+    assert fs('+1 -1', allow_invalid=True) is fs.infimum
+    info = fs.cache_info()
+    assert (info.hits, info.misses, info.currsize) == (2, 2, 2)
+
+    fs.set_cache_size(1)
+    assert fs.cache_info().evictions == 1
+    fs.set_cache_size(0)
+    assert fs('1sg') is fs('1sg')
+    assert fs.cache_info().currsize == 0
+
+    fs.cache_clear()
+    assert fs.cache_info() == (0, 0, 0, 0, 0)
+
+
+@pytest.mark.parametrize('name', [c.key for c in Config])
+def test_parse_tokens(name):
+    fs = FeatureSystem(name)
+    for f in fs:
+        for string in (f.string, f.string_maximal,
+                       f.string.upper(), f.string.replace('+', ''),
+                       f.string_maximal.replace(' ', '  ')):
+            assert fs.parse(string) == fs.parse._parse(string)
+
+
+@pytest.mark.parametrize('name', [c.key for c in Config])
+def test_lookup(name):
+    fs = FeatureSystem(name)
+    properties = fs.context.properties
+    for features in itertools.combinations(properties, 2):
+        result = fs(features, allow_invalid=True)
+        assert result.index == fs.lattice(features).index
+
+
+@pytest.mark.usefixtures('clear_unnamed')
+def test_lookup_key_table(monkeypatch, fs_noname):
+    def closure(mask):
+        raise AssertionError('unexpected closure')
+
+    monkeypatch.setattr(fs_noname, '_closure', closure)
+    expected = fs_noname.FeatureSet('+1 +sg')
+    for features in ('sg 1', '+1 +sg', '1SG', ['+sg', '+1'], ('+1', '+sg', '+1'),
+                     expected.concept.intent):
+        assert fs_noname(features) is expected
+
+
+@pytest.mark.parametrize('name', [c.key for c in Config])
+def test_conflicts(name):
+    fs = FeatureSystem(name)
+    for features in itertools.combinations(fs.context.properties, 3):
+        conflicts = fs.conflicts(features)
+        assert (not conflicts) == (fs(features, allow_invalid=True) is not fs.infimum)
+        assert set(conflicts) <= set(features)
+        if conflicts:
+            for k in range(len(conflicts)):
+                rest = conflicts[:k] + conflicts[k + 1:]
+                assert fs(rest, allow_invalid=True) is not fs.infimum
+
+
+def test_conflicts_message(fs):
+    with pytest.raises(ValueError, match=r"a valid feature set in .*"
+                                         r" \(conflicting: \['\+1', '\+2'\]\)\.$"):
+        fs('+sg +1 +2')
+
+
+@pytest.mark.usefixtures('clear_unnamed')
+def test_validate_many(fs_noname):
+    stats = fs_noname.instrument()
+    try:
+        result = list(fs_noname.validate_many(['1sg', '-1 +1', '', '-1 +1']))
+    finally:
+        fs_noname.uninstrument()
+    assert result == [(), ('-1', '+1'), (), ('-1', '+1')]
+    assert stats.invalid == 2
+    assert stats.info()['parse'].count == 3
+
+
+@pytest.mark.usefixtures('clear_unnamed')
+def test_validate_many_bounded(fs_noname):
+    fs_noname.set_cache_size(1)
+    try:
+        strings = ['1sg', '-1 +1'] * 3
+        expected = [fs_noname.conflicts(s) for s in strings]
+        assert list(fs_noname.validate_many(strings)) == expected
+        assert list(fs_noname.many(strings, allow_invalid=True)) == [
+            fs_noname(s, allow_invalid=True) for s in strings]
+        assert len(fs_noname._cache) <= 1
+    finally:
+        fs_noname.set_cache_size(FeatureSystem.cache_size)
+
+
+@pytest.mark.parametrize('name', [c.key for c in Config])
+def test_select(name):
+    fs = FeatureSystem(name)
+    conditions = {'subsumes': lambda f, x: f.subsumes(x),
+                  'implies': lambda f, x: f.implies(x),
+                  'compatible_with': lambda f, x: not f.incompatible_with(x),
+                  'incompatible_with': lambda f, x: f.incompatible_with(x)}
+    for x in fs:
+        for condition, predicate in conditions.items():
+            expected = [f.index for f in fs if predicate(f, x)]
+            assert list(fs.select_indexes(**{condition: x})) == expected
+
+    sizes = {f.index: bin(f._extent).count('1') for f in fs}
+    for extent_size in (0, 1, 2, range(3), [1, 3]):
+        expected = [i for i, size in sizes.items()
+                    if (size == extent_size if isinstance(extent_size, int)
+                        else size in extent_size)]
+        assert list(fs.select_indexes(extent_size=extent_size)) == expected
+
+
+def test_select_combined(fs):
+    result = fs.select(implies='-3', incompatible_with='sg', extent_size=2)
+    assert list(result) == [fs('-3 +pl')]
+    assert list(fs.select()) == list(fs)
+
+
+@pytest.mark.usefixtures('clear_unnamed')
+@pytest.mark.parametrize('name', ['plural', 'inclusive-dual-gender'])
+def test_cache_directory(monkeypatch, tmp_path, name):
+    fs = FeatureSystem(name)
+    monkeypatch.setattr(FeatureSystem, 'cache_directory', str(tmp_path))
+    built = FeatureSystem(Config.create(context=fs._config.context))
+    assert len(list(tmp_path.iterdir())) == 1
+
+    FeatureSystem.clear_unnamed()
+    monkeypatch.setattr(FeatureSystem, '_make_context', None)
+    loaded = FeatureSystem(Config.create(context=fs._config.context))
+    assert len(loaded) == len(built)
+    for f, g in zip(built, loaded, strict=True):
+        assert (f.string, f.string_maximal, f.string_extent) \
+               == (g.string, g.string_maximal, g.string_extent)
+        assert [n.index for n in f.upper_neighbors] == [n.index for n in g.upper_neighbors]
+        assert [n.index for n in f.lower_neighbors] == [n.index for n in g.lower_neighbors]
+        assert [a.index for a in f.atoms] == [a.index for a in g.atoms]
+    assert loaded(fs.atoms[0].string).index == fs.atoms[0].index
+
+
+@pytest.mark.usefixtures('clear_unnamed')
+def test_cache_directory_invalid(monkeypatch, tmp_path, fs):
+    monkeypatch.setattr(FeatureSystem, 'cache_directory', str(tmp_path))
+    config = Config.create(context=fs._config.context)
+    FeatureSystem(config)
+    path, = tmp_path.iterdir()
+    path.write_bytes(path.read_bytes()[:20])
+    FeatureSystem.clear_unnamed()
+    assert len(FeatureSystem(config)) == len(fs)
+    path.write_bytes(b'spam')
+    FeatureSystem.clear_unnamed()
+    assert len(FeatureSystem(config)) == len(fs)
+
+
+@pytest.mark.usefixtures('clear_unnamed')
+def test_cache_directory_unwritable(monkeypatch, tmp_path, caplog, fs):
+    import concepts
+
+    def todict(self, ignore_lattice=False):
+        raise AttributeError('todict')
+
+    monkeypatch.setattr(concepts.Context, 'todict', todict)
+    monkeypatch.setattr(FeatureSystem, 'cache_directory', str(tmp_path))
+    built = FeatureSystem(Config.create(context=fs._config.context))
+    assert len(built) == len(fs)
+    assert not list(tmp_path.iterdir())
+    assert 'cannot write cache file' in caplog.text
+
+
+@pytest.mark.usefixtures('clear_unnamed')
+def test_lazy(monkeypatch, fs):
+    monkeypatch.setattr(FeatureSystem, 'lazy', True)
+    lazy = FeatureSystem(Config.create(context=fs._config.context))
+    assert 'lattice' not in vars(lazy)
+    assert lazy.FeatureSet.system is lazy
+
+    one = lazy('1')
+    assert 'lattice' in vars(lazy)
+    assert not hasattr(one, '_string_maximal')
+    assert one.string_maximal == fs('1').string_maximal
+
+    with pytest.raises(AttributeError, match=r'spam'):
+        lazy.spam
+
+
+def test_lazy_invalid(monkeypatch):
+    monkeypatch.setattr(FeatureSystem, 'lazy', True)
+    config = Config.create(context='''
+        |catholic|protestant|
+    spam|    X   |          |
+    eggs|    X   |          |
+    ''')
+    fs = FeatureSystem(config)
+    with pytest.raises(ValueError, match=r'individual'):
+        len(fs)
+
+
+@pytest.mark.usefixtures('clear_unnamed')
+def test_unnamed_dedup(fs):
+    first = FeatureSystem(Config.create(context=fs._config.context))
+    assert FeatureSystem(Config.create(context=fs._config.context)) is first
+    assert FeatureSystem(Config.create(context=fs._config.context,
+                                       str_maximal=True)) is not first
+
+
+@pytest.mark.usefixtures('clear_unnamed')
+def test_unnamed_subclass(fs):
+    class System(FeatureSystem):
+        lookup_tables = True
+
+    base = FeatureSystem(Config.create(context=fs._config.context))
+    result = System(Config.create(context=fs._config.context))
+    assert type(result) is System and result is not base
+    assert System(Config.create(context=fs._config.context)) is result
+    assert FeatureSystem(Config.create(context=fs._config.context)) is base
+
+
+@pytest.mark.usefixtures('clear_unnamed')
+def test_unnamed_maxsize(monkeypatch, fs):
+    monkeypatch.setattr(FeatureSystem, 'unnamed_maxsize', 0)
+    ref = weakref.ref(FeatureSystem(Config.create(context=fs._config.context)))
+    gc.collect()
+    assert ref() is None
+
+
+@pytest.mark.usefixtures('clear_unnamed')
+def test_single_flight(monkeypatch, fs):
+    builds = []
+    build = FeatureSystem._build
+
+    def slow_build(self):
+        builds.append(self)
+        time.sleep(0.05)
+        build(self)
+
+    monkeypatch.setattr(FeatureSystem, '_build', slow_build)
+    config = Config.create(context=fs._config.context)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(lambda _: FeatureSystem(config), range(8)))
+    assert len(builds) == 1
+    assert all(r is results[0] for r in results)
+
+
+@pytest.mark.usefixtures('clear_unnamed')
+def test_lazy_single_flight(monkeypatch, fs):
+    monkeypatch.setattr(FeatureSystem, 'lazy', True)
+    lazy = FeatureSystem(Config.create(context=fs._config.context))
+    builds = []
+    build = FeatureSystem._build
+
+    def slow_build(self):
+        builds.append(self)
+        time.sleep(0.05)
+        build(self)
+
+    monkeypatch.setattr(FeatureSystem, '_build', slow_build)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(lambda _: lazy('1sg'), range(8)))
+    assert len(builds) == 1
+    assert all(r is results[0] for r in results)
+
+
+@pytest.mark.usefixtures('clear_unnamed')
+def test_instrument(fs_noname):
+    events = []
+    assert fs_noname.stats is None
+    stats = fs_noname.instrument(callback=lambda *args: events.append(args))
+    assert fs_noname.instrument() is stats
+    fs_noname.cache_clear()
+    try:
+        fs_noname('1sg')
+        fs_noname('1sg')
+        fs_noname('1').upset()
+        fs_noname('1').downset()
+        list(fs_noname.upset_union([fs_noname('1')]))
+        with pytest.raises(ValueError, match=r'not a valid feature set'):
+            fs_noname('+1 -1')
+    finally:
+        assert fs_noname.uninstrument() is stats
+
+    info = stats.info()
+    assert info['parse'].count == 3
+    assert info['closure'].count == 1  # '1sg' and '1' are minimal intents
+    assert {op: info[op].count for op in ('upset', 'downset', 'upset_union')} \
+           == {'upset': 1, 'downset': 1, 'upset_union': 1}
+    assert all(i.total >= i.p99 >= i.p90 >= i.p50 >= 0 for i in info.values())
+    assert stats.invalid == 1
+    assert (fs_noname, 'invalid', None) in events
+    assert [op for _, op, _ in events].count('parse') == 3
+
+    assert fs_noname.stats is None and fs_noname.uninstrument() is None
+    fs_noname('1').upset()
+    assert stats.info()['upset'].count == 1
+    assert 'upset' not in vars(fs_noname.FeatureSet)
+
+
+@pytest.mark.usefixtures('clear_unnamed')
+def test_instrumentation_build(monkeypatch, fs_noname):
+    monkeypatch.setattr(FeatureSystem, 'instrumentation', True)
+    fs = FeatureSystem(Config.create(context=fs_noname._config.context, str_maximal=True))
+    assert fs.stats.info()['build'].count == 1
+
+
+@pytest.mark.parametrize('key', ['plural', 'dual', 'gender'])
+def test_upset_downset_order(key):
+    fs = FeatureSystem(key)
+    for f in fs:
+        assert [g.index for g in f.upset()] == [c.index for c in f.concept.upset()]
+        assert [g.index for g in f.downset()] == [c.index for c in f.concept.downset()]
+    pairs = list(zip(fs, reversed(fs)))[::3]
+    for f, g in pairs:
+        concepts = [f.concept, g.concept]
+        assert fs.upset_indexes([f, g]) \
+               == tuple(c.index for c in fs.lattice.upset_union(concepts))
+        assert fs.downset_indexes([f, g]) \
+               == tuple(c.index for c in fs.lattice.downset_union(concepts))
+    assert fs.upset_indexes([]) == fs.downset_indexes([]) == ()
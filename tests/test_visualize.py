@@ -0,0 +1,53 @@
+import io
+
+import graphviz
+import pytest
+
+from features import visualize
+from features.meta import Config
+from features.systems import FeatureSystem
+
+
+def test_render_all(monkeypatch, tmp_path):
+    def render(self, *args, **kwargs):
+        if self.name == 'plural':
+            raise RuntimeError('spam')
+
+    monkeypatch.setattr(graphviz.Digraph, 'render', render)
+    results = visualize.render_all(directory=tmp_path)
+    assert [r.key for r in results] == [c.key for c in Config]
+    assert all(r.seconds >= 0 for r in results)
+    assert {r.key: r.error for r in results if r.error} == {'plural': 'RuntimeError: spam'}
+
+
+def test_render_all_workers(tmp_path):
+    results = visualize.render_all(directory=tmp_path, workers=2)
+    assert [r.key for r in results] == [c.key for c in Config]
+
+
+def test_render_all_workers_added(tmp_path, extra_config):
+    results = visualize.render_all(directory=tmp_path / 'out', workers=2)
+    assert [r.key for r in results] == [c.key for c in Config]
+    assert results[0].key == 'extra'
+    source = (tmp_path / 'out' / 'fs-extra.gv').read_text(encoding='utf-8')
+    assert source == FeatureSystem('extra').graphviz().source
+
+
+@pytest.mark.parametrize('name', [c.key for c in Config])
+@pytest.mark.parametrize('maximal_label, topdown', [(False, False), (True, True)])
+@pytest.mark.parametrize('highlight', [False, True])
+def test_write_dot(name, maximal_label, topdown, highlight):
+    fs = FeatureSystem(name)
+    highlight = fs[len(fs) // 2] if highlight else None
+    expected = fs.graphviz(highlight=highlight, maximal_label=maximal_label,
+                           topdown=topdown).source
+    file = io.StringIO()
+    fs.write_dot(file, highlight=highlight, maximal_label=maximal_label,
+                 topdown=topdown)
+    assert file.getvalue() == expected
+
+
+def test_write_dot_path(tmp_path, fs):
+    path = tmp_path / 'fs.gv'
+    fs.write_dot(path)
+    assert path.read_text(encoding='utf-8') == fs.graphviz().source
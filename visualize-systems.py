@@ -7,4 +7,7 @@ DIRECTORY = 'visualize-output'
 FORMAT = 'pdf'
 
 
-features.visualize.render_all(directory=DIRECTORY, format=FORMAT)
+for key, seconds, error in features.visualize.render_all(directory=DIRECTORY,
+                                                         format=FORMAT,
+                                                         workers=None):
+    print(f'{key:<30} {seconds:.3f}s', error if error is not None else '')